@@ -1,10 +1,20 @@
 from kivy.app import App
 from kivy.core.window import Window
 from kivy.uix.boxlayout import BoxLayout
-from kivy.graphics import Rectangle, Color, Ellipse
+from kivy.graphics import Rectangle, Color, Ellipse, InstructionGroup
 from kivy.clock import Clock
 from kivy.uix.label import Label
 import random
+from collections import deque
+from itertools import islice
+
+from simulations.simulation import interpolate
+from simulations.snake import SnakeSimulation, WINDOW_SIZE, FOOD_SIZE
+from simulations.replay import Recorder
+
+# File where the key events of each game are recorded, to replay the game with
+#   python -m simulations.replay (None to not record)
+RECORD_FILE = None
 
 '''
     ---------------------------------------------
@@ -27,11 +37,10 @@ import random
         4)  I changed the boxes into circles
         
         5) I randomized the color of the food
-'''
 
-WINDOW_SIZE = (600, 400)
-FOOD_SIZE = 10
-TIME = 0.1  # Refresh time (The smaller it is, the faster the game)
+        6) The rules of the game live in simulations/snake.py, which doesn't need kivy,
+            this file only handles the keyboard and draws the game
+'''
 
 
 '''
@@ -40,13 +49,17 @@ TIME = 0.1  # Refresh time (The smaller it is, the faster the game)
 '''
 class SnakeGame(BoxLayout):
 
+    # When True, an ellipse is created once for every part of the snake, and at each tick only the
+    #   ellipses of the tail are moved to the new head, and the head and the tail are drawn between
+    #   their locations before and after the last tick at every frame. When False, the canvas is
+    #   cleared and every ellipse is created again at each tick
+    PERSISTENT_RENDERING = True
+
     def __init__(self):
         super(SnakeGame, self).__init__()
 
-        self.game_over = False  # keeps track of whether or not the game is over
         self.start()
         self.color = (0.8, 0.1, 0.1, 1) # initial color of the food (red)
-        self.previous_key = ''
 
     '''
         This method creates the snake, displays the first food item and starts the game
@@ -55,23 +68,42 @@ class SnakeGame(BoxLayout):
         self.size = WINDOW_SIZE
         Window.size = self.size
 
-        # randomize the initial position of the snake
-        snake_head = self.random_box()
-        self.snake = Snake(snake_head[0], snake_head[1])
+        # create the snake and the first food item
+        seed = random.getrandbits(64)
+        self.game = SnakeSimulation(*self.size, seed=seed)
+        # score of the game when the food was last drawn, to change the color of the food when it changes
+        self.drawn_score = self.game.score()
+
+        # the keys are sent to the game through the recorder when recording
+        self.controls = Recorder(self.game, RECORD_FILE, 'snake', seed) if RECORD_FILE else self.game
 
         # keyboard listener setup
         self._keyboard = Window.request_keyboard(self._keyboard_closed, self)
         self._keyboard.bind(on_key_down=self._on_keyboard_down)
 
-        # create food for the first time and draw it
-        self.create_food()
+        # draw the food
         self.canvas.before.clear()
-        with self.canvas.before:
-            Color(random.uniform(0,1), random.uniform(0, 1), random.uniform(0, 1), 1)
-            self.show_food()
+        if self.PERSISTENT_RENDERING:
+            self.create_instructions()
+        else:
+            with self.canvas.before:
+                Color(random.uniform(0,1), random.uniform(0, 1), random.uniform(0, 1), 1)
+                self.show_food()
+
+        # start the clock: draw at every frame, the simulation runs its ticks at its own pace
+        self.event = Clock.schedule_interval(self.draw, 0)
+
+    @property
+    def snake(self):
+        return self.game.snake
 
-        # start the clock
-        self.event = Clock.schedule_interval(self.draw, TIME)
+    @property
+    def food(self):
+        return self.game.food
+
+    @property
+    def game_over(self):
+        return self.game.game_over
 
     '''
         Closes the listener when necessary
@@ -91,186 +123,148 @@ class SnakeGame(BoxLayout):
             self.restart()
             return
 
-        # when the snake hasn't eaten yet, all movements are possible
-        if self.previous_key == '' or len(self.snake.body) == 1:
-            if key == 'w': self.snake.change_speed(0, FOOD_SIZE)
-            if key == 's': self.snake.change_speed(0, -FOOD_SIZE)
-            if key == 'a': self.snake.change_speed(-FOOD_SIZE, 0)
-            if key == 'd': self.snake.change_speed(FOOD_SIZE, 0)
-
-        # Once the snake starts eating, do not allow backwards movements
-        else:
-            if key == 'w' and not self.previous_key in ['s', 'w']: self.snake.change_speed(0, FOOD_SIZE)
-            if key == 's' and not self.previous_key in ['w', 's']: self.snake.change_speed(0, -FOOD_SIZE)
-            if key == 'a' and not self.previous_key in ['d', 'a']: self.snake.change_speed(-FOOD_SIZE, 0)
-            if key == 'd' and not self.previous_key in ['a', 'd']: self.snake.change_speed(FOOD_SIZE, 0)
-
-        # save the previous movement
-        self.previous_key = key
+        self.controls.press(key)
 
     '''
         This method updates the movement of the snake, the location of the food and the status of the game
     '''
     def draw(self, time):
-        # check if the snake is dead
-        self.game_over = self.snake.dies(*self.size)
+        ticks = self.game.step(time)
 
         if self.game_over:
             # stop the game and output the score
             self.event.cancel()
-            self.add_widget(Label(text = "Game Over! Score: {}. Press Enter to Restart".format(len(self.snake.body) - 1)))
+            if RECORD_FILE:
+                self.controls.close()
+            self.add_widget(Label(text = "Game Over! Score: {}. Press Enter to Restart".format(self.game.score())))
         if not self.game_over:
-            # update the movement of the snake
-            self.canvas.before.clear()
-            with self.canvas.before:
-                self.snake.update(*self.size)
-                self.snake.show_head()
-                self.snake.show_body()
-                # grow the snake if it eats food, then create a new food item
-                if self.snake.ate(self.food):
-                    self.snake.grow()
-                    self.create_food()
-                    self.color = (random.uniform(0, 1), random.uniform(0, 1), random.uniform(0, 1), 1)
-                Color(*self.color)
-                self.show_food()
+            # the snake ate since the last frame (during any of the ticks run), change the color of the food
+            if self.game.score() != self.drawn_score:
+                self.drawn_score = self.game.score()
+                self.color = (random.uniform(0, 1), random.uniform(0, 1), random.uniform(0, 1), 1)
+
+            # draw the snake and the food
+            if self.PERSISTENT_RENDERING:
+                self.update_instructions()
+            elif ticks:
+                self.canvas.before.clear()
+                with self.canvas.before:
+                    self.show_head()
+                    self.show_body()
+                    Color(*self.color)
+                    self.show_food()
 
         return not self.game_over
 
     '''
-        Clears the window when the game is over, then restarts it
-    '''
-    def restart(self):
-        self.clear_widgets()
-        self.start()
-
-    '''
-        returns a random possible location of the snake (or food) on the grid
+        Creates the ellipses of the snake and the food once, so that they can be updated in place afterwards
     '''
-    def random_box(self):
-        # divide the window into squares, and pick a random square
-        max_x = self.size[0] // FOOD_SIZE
-        max_y = self.size[1] // FOOD_SIZE
+    def create_instructions(self):
+        # the ellipses of the snake, in the same order as the parts of its body (the head last)
+        self.snake_group = InstructionGroup()
+        self.snake_group.add(Color(1, 1, 1, 1))
+        self.segments = deque()
+        # number of moves of the snake already drawn
+        self.drawn_moves = self.snake.moves
+        # ellipses drawn between two ticks, with the location of their part of the body
+        self.interpolated = []
+        for bodypart in self.snake.body:
+            self.add_segment(bodypart)
 
-        # 1 and -1 are to avoid the edges
-        # multiply back by FOOD_SIZE to get the actual location
-        x = random.randint(1, max_x - 1) * FOOD_SIZE
-        y = random.randint(1, max_y - 1) * FOOD_SIZE
+        self.canvas.before.add(self.snake_group)
+        self.food_color = Color(random.uniform(0,1), random.uniform(0, 1), random.uniform(0, 1), 1)
+        self.canvas.before.add(self.food_color)
+        self.food_ellipse = self.show_food()
+        self.canvas.before.add(self.food_ellipse)
 
-        return x, y
+    def add_segment(self, pos):
+        segment = Ellipse(pos = pos, size = (FOOD_SIZE, FOOD_SIZE))
+        self.segments.append(segment)
+        self.snake_group.add(segment)
 
     '''
-        creates food at a random location
+        Every move of the snake removes its tail and adds a new head, so the ellipse of the tail is reused
+            for the new head, and an ellipse is only added when the snake grows
     '''
-    def create_food(self):
-        x, y = self.random_box()
-        self.food = [x, y]
+    def update_instructions(self):
+        # put the ellipses drawn between two ticks back on their part of the body first
+        for segment, bodypart in self.interpolated:
+            segment.pos = bodypart
 
-    '''
-        Display the food
-    '''
-    def show_food(self):
-        return Ellipse(pos = (self.food[0], self.food[1]), size = (FOOD_SIZE, FOOD_SIZE))
+        body = self.snake.body
+        moves = self.snake.moves - self.drawn_moves
+        self.drawn_moves = self.snake.moves
+        grown = len(body) - len(self.segments)
 
+        # the ellipses of the moved tail parts become the last ellipses, then the new parts are added
+        self.segments.rotate(-moves)
+        for _ in range(grown):
+            self.add_segment(body[-1])
 
-'''
-    This class represents a Snake, and the behaviours associated with it: moving the snake, 
-        checking if it is in bounds, checking if he bit itself, etc
-'''
-class Snake:
-    def __init__(self, x = 0, y = 0):
-        self.x = x
-        self.y = y
-        self.xspeed = FOOD_SIZE
-        self.yspeed = 0
-        # add the head of the snake to the body
-        self.body = [[self.x, self.y]]
+        # only the last parts of the body changed
+        changed = min(moves + grown, len(body))
+        for segment, bodypart in zip(islice(reversed(self.segments), changed), reversed(body)):
+            segment.pos = bodypart
+        self.interpolate_ends()
 
-    '''
-        Moves the snake in the direction given by the xspeed and yspeed 
-        (moves the body of the snake as well)
-    '''
-    def update(self, width, height):
-        self.x += self.xspeed
-        self.y += self.yspeed
-        self.move_body()
+        self.food_color.rgba = self.color
+        self.food_ellipse.pos = (self.food[0], self.food[1])
 
     '''
-        Changes the direction of the snake
+        Draws the head and the tail between their locations before and after the last move, depending
+            on the time passed since the last tick, so that the snake moves smoothly at any frame rate
     '''
-    def change_speed(self, xspeed, yspeed):
-        self.xspeed = xspeed
-        self.yspeed = yspeed
+    def interpolate_ends(self):
+        snake = self.snake
+        body = snake.body
+        alpha = self.game.interpolation()
+        head = body[-1]
+        self.interpolated = []
 
-    '''
-        Moves the snake's body
-    '''
-    def move_body(self):
-        # Set the location of each body part to the location of the body part before him
-        for i in range(len(self.body) - 1):
-            self.body[i][0] = self.body[i + 1][0]
-            self.body[i][1] = self.body[i + 1][1]
-        if len(self.body) > 0:
-            # Sets the location of the first body part to the current location of the snake (since the first
-            #    body part is the head in my design)
-            self.body[-1][0] = self.x
-            self.body[-1][1] = self.y
+        # the head is in the body twice (or more) right after the snake ate
+        head_pos = interpolate(snake.previous_head, head, alpha)
+        for segment, bodypart in zip(reversed(self.segments), reversed(body)):
+            if bodypart != head:
+                break
+            self.interpolated.append((segment, bodypart))
+            segment.pos = head_pos
+
+        if body[0] != head:
+            self.interpolated.append((self.segments[0], body[0]))
+            self.segments[0].pos = interpolate(snake.previous_tail, body[0], alpha)
 
     '''
-        Grows the snake, i.e. adds the newly consumed food to the snake's body
+        Clears the window when the game is over, then restarts it
     '''
-    def grow(self):
-        self.body.append([self.x , self.y])
-
+    def restart(self):
+        self.clear_widgets()
+        self.start()
 
     '''
-        Checks whether or not the snake ate the food
+        Display the food
     '''
-    def ate(self, food):
-        # The snake ate the food if they are at the same location
-        return self.x == food[0] and self.y == food[1]
+    def show_food(self):
+        return Ellipse(pos = (self.food[0], self.food[1]), size = (FOOD_SIZE, FOOD_SIZE))
 
     '''
         draw the head of the snake
     '''
     def show_head(self):
-        return Ellipse(pos = (self.x, self.y), size = (FOOD_SIZE, FOOD_SIZE))
+        return Ellipse(pos = (self.snake.x, self.snake.y), size = (FOOD_SIZE, FOOD_SIZE))
 
     '''
         draw the body of the snake
     '''
     def show_body(self):
         body = []
-        for bodypart in self.body:
+        for bodypart in self.snake.body:
             body.append(Ellipse(pos = bodypart, size = (FOOD_SIZE, FOOD_SIZE)))
         return body
 
-    '''
-        Checks if the snake dies
-    '''
-    def dies(self, width, height):
-        return self.eats_itself() or self.out_of_bounds(width, height)
-
-    '''
-        Checks if the snake eats itself
-    '''
-    def eats_itself(self):
-        for i in range(len(self.body) - 2):
-            if self.x == self.body[i][0] and self.y == self.body[i][1]:
-                return True
-        return False
-
-    '''
-        checks if the snake is out of bounds
-    '''
-    def out_of_bounds(self, width, height):
-        return self.x < 0 or self.x > width - FOOD_SIZE or \
-                self.y < 0 or self.y > height - FOOD_SIZE
-
-
 
 class SnakeApp(App):
     def build(self):
         return SnakeGame()
 
-SnakeApp().run()
-
+if __name__ == '__main__':
+    SnakeApp().run()
@@ -1,9 +1,14 @@
 from kivy.app import App
 from kivy.uix.boxlayout import BoxLayout
-from kivy.graphics import Color, Line
+from kivy.graphics import Color, Line, Mesh
 from kivy.core.window import Window
 from kivy.clock import Clock
-import random
+import numpy as np
+
+from simulations.purple_rain import RainSimulation, SPLASH_TICKS
+
+# The indices of a mesh are 16 bits numbers, so a mesh holds at most 65536 vertices (4 per line)
+MAX_LINES_PER_MESH = 65536 // 4
 
 '''
     ---------------------------------------------
@@ -17,121 +22,118 @@ import random
 
     Modifications:
         I added the splashes at the bottom
-'''
 
+        The drops fall in simulations/purple_rain.py, which doesn't need kivy,
+        this file only draws them
 '''
-    Maps the number x from the range [x1, x2] to a corresponding number in the range [y1, y2]
-'''
-def map(x, x1, x2, y1, y2):
-    return y1 + x * (y2 - y1) / (x2 - x1)
 
 '''
     Class that displays everything
 '''
 class PurpleRain(BoxLayout):
 
+    # When True, all the drops and all the splashes are drawn by a few meshes created once, whose
+    #   vertices are updated in place from the arrays of the simulation at each tick.
+    #   When False, the canvas is cleared and a Line is created for every drop and splash at each tick
+    PERSISTENT_RENDERING = True
+
     def __init__(self):
         super(PurpleRain, self).__init__()
         Window.size = (640, 360)
         Window.clearcolor = (0.91, 0.91, 0.98, 1)
 
         # create the drops
-        self.drops = [Drop(*Window.size) for i in range(100)]
+        self.rain = RainSimulation(*Window.size)
+
+        if self.PERSISTENT_RENDERING:
+            with self.canvas.before:
+                Color(0.54, 0.17, 0.89)
+                # a drop splashes at most once per tick, and each splash has two lines
+                self.splash_batch = LineBatch(2 * len(self.rain.store) * SPLASH_TICKS)
+                self.drop_batch = LineBatch(len(self.rain.store))
 
         # start the clock
-        Clock.schedule_interval(self.update_drops, 0.05)
+        Clock.schedule_interval(self.update_drops, self.rain.TIME)
 
     '''
         Updates the drops locations and displays them
     '''
     def update_drops(self, time):
+        if self.rain.step(time) == 0:
+            return
+
+        if self.PERSISTENT_RENDERING:
+            self.splash_batch.update(*self.rain.get_splashlines())
+            self.drop_batch.update(self.rain.get_lines(), self.rain.store.thickness)
+            return
+
         self.canvas.before.clear()
         with self.canvas.before:
             Color(0.54, 0.17, 0.89)
-            for drop in self.drops:
-                drop.fall()
-                drop.show()
-
-'''
-    This class represents a single drop, and provides behaviours such 
-    as falling
-'''
-class Drop:
-    def __init__(self, width, height):
-        # get the window's dimensions
-        self.window_width = width
-        self.window_height = height
-
-        # pick a random location for the drop
-        self.x = random.randint(0, width)
-        self.y = random.randint(height, height + 500)  # the drop will start out of the screen
-        self.z = random.randint(0, 20)  # represents the depth (in an attempt to make the simulation 3D)
-
-        # The closer to the screen, the higher the gravity, the faster the drop is, the
-        #   longer and thicker it is as well
-        self.gravity = map(self.z, 0, 20, 0, 0.5)
-        self.yspeed = map(self.z, 0, 20, 4, 10)
-        self.length = map(self.z, 0, 20, 10, 20)
-        self.thickness = map(self.z, 0, 20, 1, 1.5)
-
-    '''
-        Moves the drop down, and relocates it if the drop hits the bottom
-    '''
-    def fall(self):
-        # Move the drop down faster with gravity
-        self.y -= self.yspeed
-        self.yspeed += self.gravity
-
-        # If the drop hits the bottom, create the splash, pop it, then relocate the drop
-        if self.y - self.length < 0:
-            # relocating
-            self.y = random.randint(self.window_height, self.window_height + 100)
-            self.z = random.randint(0, 20)
-
-            # creating and poping splash
-            splash = Splash(self.x, 0, self.length)
-            for splashline in splash.get_splashlines():
-                Line(points = splashline, width = self.thickness)
-            self.yspeed = map(self.z, 0, 20, 4, 10)
-
-    '''
-        Displays the drop
-    '''
-    def show(self):
-        return Line(points = (self.x, self.y, self.x, self.y - self.length), width = self.thickness)
+            # pop the splashes of the drops that hit the bottom
+            splashlines, thicknesses = self.rain.get_splashlines()
+            for splashline, thickness in zip(splashlines.tolist(), thicknesses.tolist()):
+                Line(points = splashline, width = thickness)
+            for line, thickness in zip(self.rain.get_lines().tolist(), self.rain.store.thickness.tolist()):
+                Line(points = line, width = thickness)
 
 '''
-    Splash representation (two lines in symmetric and diagonal directions)
+    Draws many lines of different widths with meshes: each line is a rectangle of two triangles, whose
+        four vertices are written in a numpy array shared with the meshes (so setting the lines doesn't
+        create any instruction). The rectangles that are not used have all their vertices at the origin
 '''
-class Splash:
-    def __init__(self, x, y, drop_length):
-        # location of the drop
-        self.x = x
-        self.y = y
-
-        # keeps track of whether or not the splash ocuured already, in which case don't splash again
-        self.splashed = False
-
-        # the splash lines length are proportional to the drop length, but smaller
-        self.length = drop_length / 15
-
-        # make the splash lines inclined and symmetric
-        self.splashlines = [
-            (x + 5, y + 10, x + 5 + self.length,  y + 10 + self.length),
-            (x - 5, y + 10, x - 5 - self.length, y + 10 + self.length),
-        ]
+class LineBatch:
+    def __init__(self, capacity):
+        # (x, y, u, v) of the 4 corners of each line
+        self.vertices = np.zeros((capacity, 4, 4), dtype=np.float32)
+        # number of lines drawn
+        self.count = 0
+
+        # split the lines between as many meshes as needed, each mesh drawing its part of the vertices
+        self.meshes = []
+        for start in range(0, capacity, MAX_LINES_PER_MESH):
+            lines = min(MAX_LINES_PER_MESH, capacity - start)
+            indices = (np.arange(lines)[:, None] * 4 + [0, 1, 2, 2, 3, 0]).ravel().tolist()
+            vertices = memoryview(self.vertices[start:start + lines].reshape(-1))
+            self.meshes.append(Mesh(vertices=vertices, indices=indices, mode='triangles'))
 
     '''
-        returns the splash lines
+        Sets the lines drawn, from an array of (x1, y1, x2, y2) rows and the width of each line
+            (like with a kivy Line, the line is twice as wide, and longer by width at both ends)
     '''
-    def get_splashlines(self):
-        if not self.splashed:
-            return self.splashlines
-        else:
-            return []
+    def update(self, lines, widths):
+        count = len(lines)
+        x1, y1, x2, y2 = lines[:, 0], lines[:, 1], lines[:, 2], lines[:, 3]
+
+        # vector along the line, as long as the width
+        length = np.hypot(x2 - x1, y2 - y1)
+        length[length == 0] = 1
+        dx = (x2 - x1) / length * widths
+        dy = (y2 - y1) / length * widths
+
+        # corners of the rectangle, going around it
+        vertices = self.vertices
+        vertices[:count, 0, 0] = x1 - dx - dy
+        vertices[:count, 0, 1] = y1 - dy + dx
+        vertices[:count, 1, 0] = x2 + dx - dy
+        vertices[:count, 1, 1] = y2 + dy + dx
+        vertices[:count, 2, 0] = x2 + dx + dy
+        vertices[:count, 2, 1] = y2 + dy - dx
+        vertices[:count, 3, 0] = x1 - dx + dy
+        vertices[:count, 3, 1] = y1 - dy - dx
+
+        # hide the lines that were drawn before and aren't anymore
+        if count < self.count:
+            vertices[count:self.count] = 0
+        self.count = count
+
+        # tell the meshes that their vertices changed
+        for mesh in self.meshes:
+            mesh.vertices = mesh.vertices
 
 class PurpleRainApp(App):
     def build(self):
         return PurpleRain()
 
-PurpleRainApp().run()
+if __name__ == '__main__':
+    PurpleRainApp().run()
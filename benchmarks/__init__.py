@@ -0,0 +1,5 @@
+'''
+    Benchmarks of the headless simulations, run them from the root of the repository:
+
+        python -m benchmarks.bench_simulations
+'''
@@ -0,0 +1,108 @@
+import argparse
+import json
+import math
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from simulations.maze_algorithms import ALGORITHMS, Eller, create_maze
+
+'''
+    Benchmarks the maze generators of simulations/maze_algorithms.py on square mazes of growing sizes,
+    and reports the number of cells generated per second and the peak memory of each generation.
+
+    Every case runs in its own process, so that the peak memory (maximum resident set size) only
+    counts that generation. 'eller-rows' runs Eller's algorithm without storing the grid, only
+    going through the rows, to show that its memory only depends on the width of the maze:
+
+        python -m benchmarks.bench_maze_algorithms --max-cells 100000000 --output mazes.json
+'''
+
+SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8]
+CASES = list(ALGORITHMS) + ['eller-rows']
+
+'''
+    Generates a single maze and returns its results (runs in the child process)
+'''
+def run_case(name, cells):
+    side = int(round(math.sqrt(cells)))
+    start = time.perf_counter()
+    if name == 'eller-rows':
+        for row in Eller().rows(side, side, random.Random(0)):
+            pass
+    else:
+        create_maze(side, side, name, seed=0)
+    duration = time.perf_counter() - start
+
+    # ru_maxrss is in kilobytes on linux, but in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        peak *= 1024
+
+    return {
+        'algorithm': name,
+        'cells': side * side,
+        'seconds': duration,
+        'cells_per_second': side * side / duration if duration > 0 else float('inf'),
+        'peak_memory_bytes': peak,
+    }
+
+'''
+    Runs a case in a new process and returns its results, or None if it took too long
+'''
+def run_case_in_process(name, cells, timeout):
+    try:
+        output = subprocess.run([sys.executable, '-m', 'benchmarks.bench_maze_algorithms',
+                                 '--case', name, str(cells)],
+                                stdout=subprocess.PIPE, check=True, timeout=timeout).stdout
+    except subprocess.TimeoutExpired:
+        return None
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the maze generators')
+    parser.add_argument('--only', nargs='*', choices=CASES, help='algorithms to benchmark')
+    parser.add_argument('--max-cells', type=int, default=10 ** 6, help='size of the biggest maze')
+    parser.add_argument('--timeout', type=float, help='seconds after which a case is given up')
+    parser.add_argument('--output', help='file where the results are saved as JSON')
+    parser.add_argument('--case', nargs=2, metavar=('ALGORITHM', 'CELLS'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        print(json.dumps(run_case(args.case[0], int(args.case[1]))))
+        return 0
+
+    # Memory used by a process that does nothing, to compare with
+    baseline = run_case_in_process('eller-rows', 1, None)['peak_memory_bytes']
+    print('baseline peak memory: {} B'.format(baseline))
+
+    results = []
+    for name in args.only or CASES:
+        for cells in SIZES:
+            if cells > args.max_cells:
+                continue
+            result = run_case_in_process(name, cells, args.timeout)
+            if result is None:
+                print('{:<12}{:>12} cells  timed out'.format(name, cells))
+                break
+            results.append(result)
+            print('{algorithm:<12}{cells:>12} cells {cells_per_second:>12.0f} cells/s'
+                  '  peak {peak_memory_bytes:>12} B'.format(**result))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'baseline_peak_memory_bytes': baseline,
+                'results': results,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
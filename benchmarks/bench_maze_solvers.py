@@ -0,0 +1,74 @@
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+
+from simulations.maze_algorithms import ALGORITHMS, create_maze
+from simulations.maze_solvers import SOLVERS
+
+'''
+    Benchmarks the maze solvers of simulations/maze_solvers.py on square mazes of growing sizes,
+    from the bottom left cell to the top right cell, and reports the number of cells of the maze
+    solved per second, the number of visited cells and the length of the path:
+
+        python -m benchmarks.bench_maze_solvers --max-cells 10000000 --output solvers.json
+'''
+
+SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the maze solvers')
+    parser.add_argument('--only', nargs='*', choices=list(SOLVERS), help='solvers to benchmark')
+    parser.add_argument('--algorithm', default='backtracker', choices=list(ALGORITHMS),
+                        help='algorithm generating the mazes')
+    parser.add_argument('--max-cells', type=int, default=10 ** 6, help='size of the biggest maze')
+    parser.add_argument('--output', help='file where the results are saved as JSON')
+    args = parser.parse_args(argv)
+
+    results = []
+    for cells in SIZES:
+        if cells > args.max_cells:
+            continue
+        side = int(round(math.sqrt(cells)))
+        maze = create_maze(side, side, args.algorithm, seed=0)
+
+        path_lengths = set()
+        for name in args.only or SOLVERS:
+            start = time.perf_counter()
+            path, visited = SOLVERS[name]().solve(maze)
+            duration = time.perf_counter() - start
+            path_lengths.add(len(path))
+
+            result = {
+                'solver': name,
+                'algorithm': args.algorithm,
+                'cells': side * side,
+                'seconds': duration,
+                'cells_per_second': side * side / duration if duration > 0 else float('inf'),
+                'visited': visited,
+                'path_length': len(path),
+            }
+            results.append(result)
+            print('{solver:<10}{cells:>12} cells {cells_per_second:>12.0f} cells/s'
+                  '  visited {visited:>10}  path {path_length:>10}'.format(**result))
+
+        # The mazes are perfect, so every solver has to find the same path
+        if len(path_lengths) > 1:
+            print('the solvers found paths of different lengths: {}'.format(sorted(path_lengths)))
+            return 1
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
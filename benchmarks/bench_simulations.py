@@ -0,0 +1,185 @@
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from simulations.starfield import StarfieldSimulation
+from simulations.snake import SnakeSimulation, Snake, Board, FOOD_SIZE
+from simulations.purple_rain import RainSimulation
+from simulations.space_invaders import SpaceInvadersSimulation
+from simulations.mitosis import MitosisSimulation
+from simulations.maze import MazeSimulation
+
+'''
+    Benchmarks the update loop of every simulation, headless, for growing numbers of entities.
+
+    For each simulation and each entity count, the benchmark reports the number of ticks per second,
+    the median and 99th percentile duration of a tick, the peak memory allocated while ticking and
+    the number of garbage collections triggered, then saves everything as JSON:
+
+        python -m benchmarks.bench_simulations --output before.json
+        python -m benchmarks.bench_simulations --output after.json --compare before.json
+'''
+
+'''
+    Creates a space invaders game where the player keeps firing
+'''
+def make_space_invaders(count):
+    game = SpaceInvadersSimulation(num_aliens=count, seed=0)
+    game.bullets_count = sys.maxsize
+    game.press('spacebar')
+    return game
+
+'''
+    Creates a snake game where the snake is count squares long, going right on a board wide enough
+        to move for a while
+'''
+def make_snake(count):
+    game = SnakeSimulation((2 * count + 1000) * FOOD_SIZE, 10 * FOOD_SIZE, seed=0)
+    game.board = Board(game.size[0] // FOOD_SIZE, game.size[1] // FOOD_SIZE)
+    game.snake = Snake(0, 5 * FOOD_SIZE, game.board)
+    for _ in range(count - 1):
+        game.snake.update(*game.size)
+        game.snake.grow()
+    game.create_food()
+    return game
+
+'''
+    Each benchmark is (name, what the count is, counts of the sweep, function creating the simulation
+        for a count, function checking if the simulation has to be created again)
+'''
+BENCHMARKS = [
+    ('starfield', 'stars', [100, 1000, 10000, 100000],
+     lambda count: StarfieldSimulation(num_stars=count, seed=0), None),
+    ('purple_rain', 'drops', [100, 1000, 10000, 50000],
+     lambda count: RainSimulation(num_drops=count, seed=0), None),
+    ('space_invaders', 'aliens', [10, 100, 1000, 10000],
+     make_space_invaders, lambda game: game.over),
+    ('mitosis', 'cells', [2, 100, 1000, 10000],
+     lambda count: MitosisSimulation(num_cells=count, seed=0), None),
+    ('snake', 'parts', [10, 1000, 100000],
+     make_snake, lambda game: game.game_over),
+    ('maze', 'cells', [8 * 8, 32 * 32, 128 * 128],
+     lambda count: MazeSimulation(int(count ** 0.5), int(count ** 0.5), seed=0), lambda maze: maze.done),
+]
+
+'''
+    Returns the value at the given percentile of a sorted list
+'''
+def percentile(values, p):
+    index = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[index]
+
+'''
+    Ticks the simulation the given number of times and measures each tick, recreating the
+        simulation (outside of the measures) whenever it is over
+'''
+def measure(make, is_over, count, ticks):
+    simulation = make(count)
+    durations = []
+    for _ in range(ticks):
+        if is_over and is_over(simulation):
+            simulation = make(count)
+        start = time.perf_counter()
+        simulation.tick()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+'''
+    Runs a single benchmark case and returns its results
+'''
+def run_case(name, unit, count, make, is_over, ticks):
+    # Warm up, then time the ticks
+    measure(make, is_over, count, min(ticks, 10))
+    gc.collect()
+    collections = sum(stats['collections'] for stats in gc.get_stats())
+    durations = measure(make, is_over, count, ticks)
+    collections = sum(stats['collections'] for stats in gc.get_stats()) - collections
+
+    # Measure the memory in a separate run, since tracing slows down the ticks
+    tracemalloc.start()
+    measure(make, is_over, count, min(ticks, 100))
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    total = sum(durations)
+    durations.sort()
+    return {
+        'simulation': name,
+        'unit': unit,
+        'count': count,
+        'ticks': ticks,
+        'ticks_per_second': ticks / total if total > 0 else float('inf'),
+        'p50_ms': percentile(durations, 50) * 1000,
+        'p99_ms': percentile(durations, 99) * 1000,
+        'peak_memory_bytes': peak_memory,
+        'gc_collections': collections,
+    }
+
+'''
+    Compares the results with the results of a previous run, and returns the cases that got slower
+        than the tolerance allows
+'''
+def compare(results, baseline, tolerance):
+    previous = {(r['simulation'], r['count']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        key = (result['simulation'], result['count'])
+        if key not in previous:
+            continue
+        ratio = result['ticks_per_second'] / previous[key]['ticks_per_second']
+        print('{:<16}{:>10} {:<8} {:>8.2f}x'.format(result['simulation'], result['count'], result['unit'], ratio))
+        if ratio < 1 - tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the headless simulations')
+    parser.add_argument('--ticks', type=int, default=200, help='number of ticks measured per case')
+    parser.add_argument('--only', nargs='*', help='names of the simulations to benchmark')
+    parser.add_argument('--max-count', type=int, help='skip the cases with more entities than this')
+    parser.add_argument('--output', help='file where the results are saved as JSON')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare with')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='slowdown (as a fraction of ticks per second) reported as a regression')
+    args = parser.parse_args(argv)
+
+    results = []
+    for name, unit, counts, make, is_over in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        for count in counts:
+            if args.max_count and count > args.max_count:
+                continue
+            result = run_case(name, unit, count, make, is_over, args.ticks)
+            results.append(result)
+            print('{simulation:<16}{count:>10} {unit:<8}{ticks_per_second:>12.1f} ticks/s'
+                  '  p50 {p50_ms:8.3f} ms  p99 {p99_ms:8.3f} ms'
+                  '  peak {peak_memory_bytes:>11} B  gc {gc_collections}'.format(**result))
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'ticks': args.ticks,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('{} case(s) slower than the baseline'.format(len(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
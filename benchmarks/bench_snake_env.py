@@ -0,0 +1,75 @@
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from simulations.snake_env import SnakeEnv, VecSnakeEnv
+
+'''
+    Benchmarks the snake environments of simulations/snake_env.py with random actions, and reports
+    the number of steps per second of a single SnakeEnv and of VecSnakeEnv for growing numbers of games:
+
+        python -m benchmarks.bench_snake_env --steps 1000 --output snake_env.json
+'''
+
+NUM_ENVS = [1, 64, 1024, 4096, 16384]
+
+'''
+    Returns the steps per second of a single SnakeEnv, started again whenever the game is over
+'''
+def bench_single(cols, rows, steps):
+    env = SnakeEnv(cols, rows)
+    env.reset(seed=0)
+    actions = np.random.default_rng(0).integers(0, 4, steps).tolist()
+    start = time.perf_counter()
+    for action in actions:
+        obs, reward, done, info = env.step(action)
+        if done:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+'''
+    Returns the steps per second of all the games of a VecSnakeEnv
+'''
+def bench_vec(num_envs, cols, rows, steps):
+    envs = VecSnakeEnv(num_envs, cols, rows, seed=0)
+    envs.reset()
+    actions = np.random.default_rng(0).integers(0, 4, (steps, num_envs))
+    start = time.perf_counter()
+    for step_actions in actions:
+        envs.step(step_actions)
+    return steps * num_envs / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the snake environments')
+    parser.add_argument('--cols', type=int, default=20, help='number of columns of the board')
+    parser.add_argument('--rows', type=int, default=20, help='number of rows of the board')
+    parser.add_argument('--steps', type=int, default=200, help='number of steps of each benchmark')
+    parser.add_argument('--output', help='file where the results are saved as JSON')
+    args = parser.parse_args(argv)
+
+    results = [{'env': 'single', 'games': 1,
+                'steps_per_second': bench_single(args.cols, args.rows, args.steps * 100)}]
+    for num_envs in NUM_ENVS:
+        results.append({'env': 'vec', 'games': num_envs,
+                        'steps_per_second': bench_vec(num_envs, args.cols, args.rows, args.steps)})
+    for result in results:
+        print('{env:<8}{games:>8} games {steps_per_second:>14.0f} steps/s'.format(**result))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'board': [args.cols, args.rows],
+                'results': results,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
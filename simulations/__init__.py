@@ -0,0 +1,6 @@
+'''
+    Headless versions of the coding challenges: each module holds the state of one challenge and
+    the rules to update it, without any kivy code, so that the simulations can be stepped, tested
+    and benchmarked without opening a window. The kivy scripts at the root of the repository only
+    draw the state of these simulations.
+'''
@@ -0,0 +1,381 @@
+from array import array
+
+from simulations.simulation import Simulation
+
+'''
+    Headless version of Coding Challenge #10: Maze Generator
+
+    The cells are stored column by column: the cell in column i and row j has the index i * rows + j,
+    so the cell at the top of cell k is k + 1, and the cell at its right is k + rows
+
+    Each cell is a single byte of the grid: one bit per wall, one bit telling if the cell
+    was visited, one bit telling if the cell is in the stack of the generator, and two bits
+    telling in which direction the previous cell of the stack is (the stack is walked back
+    through these bits instead of being stored apart), so a maze of 10000 x 10000 cells
+    takes about 100 MB, generator included
+'''
+
+ROWS = 8
+COLS = 8
+
+# Bits of a cell
+TOP = 1
+RIGHT = 2
+BOTTOM = 4
+LEFT = 8
+WALLS = TOP | RIGHT | BOTTOM | LEFT
+VISITED = 16
+ON_STACK = 32
+# Direction of the cell from which the generator entered a cell (the cell below it in the stack),
+#   in the two high bits
+PARENT_SHIFT = 6
+PARENT = 3 << PARENT_SHIFT
+PARENT_TOP, PARENT_RIGHT, PARENT_BOTTOM, PARENT_LEFT = (direction << PARENT_SHIFT for direction in range(4))
+
+# Name of each wall bit, and the wall on the other side of it
+WALL_NAMES = {'top': TOP, 'right': RIGHT, 'bottom': BOTTOM, 'left': LEFT}
+OPPOSITE = {TOP: BOTTOM, RIGHT: LEFT, BOTTOM: TOP, LEFT: RIGHT}
+
+# Table marking every cell visited, for bytearray.translate
+VISIT_ALL = bytes(cell | VISITED for cell in range(256))
+
+'''
+    Class generating the maze with an iterative backtracker (the stack is explicit), a given number
+        of steps per tick, or all at once with generate()
+'''
+class MazeSimulation(Simulation):
+    TIME = 0.5  # controls the speed of the maze (the smaller the time, the faster the maze is generated)
+
+    def __init__(self, rows=ROWS, cols=COLS, steps_per_tick=1, seed=None, rng=None):
+        super(MazeSimulation, self).__init__(seed, rng)
+        self.rows = rows
+        self.cols = cols
+        # number of steps of the generator run at each tick (1 animates the generation step by step)
+        self.steps_per_tick = steps_per_tick
+        # Create the cells and add it to the grid
+        self.create_cells()
+        # Index of the current visited cell
+        self.current_index = 0
+        # Number of cells in the stack of the visited cells (the cells themselves are found
+        #   by walking back from the current cell through the PARENT bits)
+        self.stack_size = 0
+        # Indices of the cells changed by generate_maze since the set was last cleared
+        #   (the renderer uses it to only redraw these cells)
+        self.dirty = set()
+
+    '''
+        Creates the grid, where every cell has its four walls and is not visited
+    '''
+    def create_cells(self):
+        self.grid = bytearray([WALLS]) * (self.rows * self.cols)
+
+    '''
+        Views over the cells of the grid, for code that still works with Cell objects
+    '''
+    @property
+    def cells(self):
+        return Cells(self)
+
+    '''
+        Index of the cell at the top, right, bottom and left of a cell, by its PARENT bits
+    '''
+    @property
+    def parent_offsets(self):
+        return (1, self.rows, -1, -self.rows)
+
+    '''
+        Stack of the visited cells, from the first one to the previous cell of the current cell
+            (rebuilt by walking back through the PARENT bits, for the display)
+    '''
+    @property
+    def stack(self):
+        grid, offsets = self.grid, self.parent_offsets
+        stack = array('I')
+        cell = self.current_index
+        for _ in range(self.stack_size):
+            cell += offsets[grid[cell] >> PARENT_SHIFT]
+            stack.append(cell)
+        stack.reverse()
+        return stack
+
+    '''
+        Checks whether or not the maze is completely generated
+    '''
+    @property
+    def done(self):
+        return self.stack_size == 0 and self.grid[self.current_index] & VISITED != 0
+
+    '''
+        Runs steps_per_tick steps of the maze generator
+    '''
+    def tick(self):
+        for _ in range(self.steps_per_tick):
+            if self.done:
+                return
+            self.generate_maze()
+
+    '''
+        Runs the maze generator until the maze is complete. This is the same algorithm as generate_maze,
+            inlined and with everything in local variables, since it runs twice per cell
+            (the changed cells are not added to self.dirty, redraw the whole maze afterwards)
+    '''
+    def generate(self):
+        grid, rows = self.grid, self.rows
+        last_column = rows * (self.cols - 1)
+        offsets = self.parent_offsets
+        # direction of the current cell from the next one, by the index move to the next one
+        #   (with a single row, the moves to the top and the bottom never happen)
+        parents = {1: PARENT_BOTTOM, rows: PARENT_LEFT, -1: PARENT_TOP, -rows: PARENT_RIGHT}
+        randrange = self.rng.randrange
+        remove_wall = self.remove_wall
+        current = self.current_index
+        stack_size = self.stack_size
+
+        while True:
+            grid[current] |= VISITED
+            neighbors = []
+            if (current + 1) % rows != 0 and not grid[current + 1] & VISITED:
+                neighbors.append(current + 1)
+            if current < last_column and not grid[current + rows] & VISITED:
+                neighbors.append(current + rows)
+            if current % rows != 0 and not grid[current - 1] & VISITED:
+                neighbors.append(current - 1)
+            if current >= rows and not grid[current - rows] & VISITED:
+                neighbors.append(current - rows)
+
+            if neighbors:
+                next_index = neighbors[randrange(len(neighbors))]
+                grid[current] |= ON_STACK
+                grid[next_index] |= parents[next_index - current]
+                stack_size += 1
+                remove_wall(current, next_index)
+                current = next_index
+            elif stack_size:
+                previous = current
+                current += offsets[grid[previous] >> PARENT_SHIFT]
+                grid[previous] &= ~PARENT
+                grid[current] &= ~ON_STACK
+                stack_size -= 1
+            else:
+                break
+
+        self.current_index = current
+        self.stack_size = stack_size
+
+    '''
+        Implementation of the maze generator
+    '''
+    def generate_maze(self):
+        self.grid[self.current_index] |= VISITED
+        self.dirty.add(self.current_index)
+        # Get a random unvisited neighbor
+        next_index = self.get_unvisited_neighbor_index(self.current_index)
+        # If a neighbor is found, remove the walls between it and the current cell, then
+        #   add the current cell to the stack
+        if next_index != -1:
+            self.grid[self.current_index] |= ON_STACK
+            self.set_parent(next_index, self.current_index)
+            self.stack_size += 1
+            self.remove_wall(self.current_index, next_index)
+            self.current_index = next_index
+            self.dirty.add(next_index)
+        else:
+            # If no neighbor is found, move back to a cell in the stack and look for its neighbors
+            #   in the next iteration
+            if self.stack_size > 0:
+                previous = self.current_index
+                self.current_index += self.parent_offsets[self.grid[previous] >> PARENT_SHIFT]
+                self.grid[previous] &= ~PARENT
+                self.stack_size -= 1
+                self.grid[self.current_index] &= ~ON_STACK
+                self.dirty.add(self.current_index)
+
+    '''
+        Checks whether or not the cell is in the stack, without looking through the stack
+    '''
+    def on_stack(self, index):
+        return self.grid[index] & ON_STACK != 0
+
+    '''
+        Stores in the PARENT bits of cell i the direction of the adjacent cell j, from which it was entered
+    '''
+    def set_parent(self, i, j):
+        rows = self.rows
+        # (the left and right neighbors are checked first, like in remove_wall)
+        if j == i + rows:
+            self.grid[i] |= PARENT_RIGHT
+        elif j == i - rows:
+            self.grid[i] |= PARENT_LEFT
+        elif j == i + 1:
+            self.grid[i] |= PARENT_TOP
+        elif j == i - 1:
+            self.grid[i] |= PARENT_BOTTOM
+
+    '''
+        Removes the walls between two adjacent cells
+    '''
+    def remove_wall(self, i, j):
+        grid = self.grid
+        rows = self.rows
+
+        # (the left and right neighbors are checked first: when there is a single row,
+        #   the cell at the right of cell i is also i + 1)
+
+        # if cell j is at the right of cell i
+        if j == i + rows:
+            # remove right wall of i and left wall of j
+            grid[i] &= ~RIGHT
+            grid[j] &= ~LEFT
+
+        # if cell j is at the left of cell i
+        elif j == i - rows:
+            # remove left wall of cell i and right wall of cell j
+            grid[i] &= ~LEFT
+            grid[j] &= ~RIGHT
+
+        # if cell j is at the top of cell i
+        elif j == i + 1:
+            # remove top wall of cell i and bottom wall of cell j
+            grid[i] &= ~TOP
+            grid[j] &= ~BOTTOM
+
+        # if cell j is at the bottom of cell i
+        elif j == i - 1:
+            # remove bottom wall of cell i and top wall of cell j
+            grid[i] &= ~BOTTOM
+            grid[j] &= ~TOP
+
+    '''
+        Returns the neighbors of cell i, as (wall between the cells, index of the neighbor) pairs
+    '''
+    def get_neighbors(self, i):
+        rows = self.rows
+        neighbors = []
+        if (i + 1) % rows != 0:
+            neighbors.append((TOP, i + 1))
+        if i < rows * (self.cols - 1):
+            neighbors.append((RIGHT, i + rows))
+        if i % rows != 0:
+            neighbors.append((BOTTOM, i - 1))
+        if i >= rows:
+            neighbors.append((LEFT, i - rows))
+        return neighbors
+
+    '''
+        Finds a random unvisited neighbor to the current cell and returns its index, or -1
+        if the cell has not visited neighbor
+    '''
+    def get_unvisited_neighbor_index(self, i):
+        grid = self.grid
+        rows, cols = self.rows, self.cols
+        neighbors_indices = []
+        # top
+        index = i + 1   # index of the cell at the top of cell i
+        # the cells at the top row have the indices rows - 1, 2 * rows - 1, 3 * rows - 1, ...
+        #   so in order for a cell to have a top neighbor, it shouldn't be on the top,
+        #   hence (i + 1) % rows != 0
+        if (i + 1) % rows != 0 and not grid[index] & VISITED:
+            neighbors_indices.append(index)
+
+        # right
+        index = i + rows    # index of the cell at the right of cell i
+        # the cells of the right column have indices from rows * (cols - 1) to rows * cols - 1
+        #   so in order for cell i to have a right neighbor, we should have i < rows * (cols - 1)
+        if i < rows * (cols - 1) and not grid[index] & VISITED:
+            neighbors_indices.append(index)
+
+        # bottom
+        index = i - 1   # index of the cell at the bottom of i
+        # the cells at the bottom row have the indices 0, rows, 2 * rows, ...
+        #   so in order for a cell to have a bottom neighbor, i shouldn't be a multiple
+        #   of rows, hence i % rows != 0
+        if i % rows != 0 and not grid[index] & VISITED:
+            neighbors_indices.append(index)
+
+        # left
+        index = i - rows    # index of the cell at the left of cell i
+        # the cells of the left column have indices from 0 to rows - 1
+        #   so in order for a cell to have a left neighbor, it shouldn't be on that left column,
+        #   hence i >= rows
+        if i >= rows and not grid[index] & VISITED:
+            neighbors_indices.append(index)
+
+        if len(neighbors_indices):
+            r = self.rng.randint(0, len(neighbors_indices) - 1)
+            return neighbors_indices[r]
+        else:
+            return -1
+
+
+'''
+    Sequence of Cell views over the grid of a maze
+'''
+class Cells:
+    def __init__(self, maze):
+        self.maze = maze
+
+    def __len__(self):
+        return len(self.maze.grid)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('cell index out of range')
+        return Cell(self.maze, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield Cell(self.maze, index)
+
+
+'''
+    Represents a Cell and the operations associated with it (coordinates, walls, isvisited)
+        (the cell is a view on one byte of the grid of a maze)
+'''
+class Cell:
+    def __init__(self, maze, index):
+        self.grid = maze.grid
+        self.index = index
+        self.i = index // maze.rows
+        self.j = index % maze.rows
+        self.walls = Walls(self.grid, index)
+
+    @property
+    def visited(self):
+        return self.grid[self.index] & VISITED != 0
+
+    @property
+    def on_stack(self):
+        return self.grid[self.index] & ON_STACK != 0
+
+    @visited.setter
+    def visited(self, visited):
+        if visited:
+            self.grid[self.index] |= VISITED
+        else:
+            self.grid[self.index] &= ~VISITED
+
+
+'''
+    Walls of a cell, read and written by name ('top', 'right', 'bottom', 'left')
+'''
+class Walls:
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __getitem__(self, name):
+        return self.grid[self.index] & WALL_NAMES[name] != 0
+
+    def __setitem__(self, name, present):
+        if present:
+            self.grid[self.index] |= WALL_NAMES[name]
+        else:
+            self.grid[self.index] &= ~WALL_NAMES[name]
+
+    def keys(self):
+        return WALL_NAMES.keys()
+
+    def items(self):
+        return [(name, self[name]) for name in WALL_NAMES]
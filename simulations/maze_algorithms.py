@@ -0,0 +1,245 @@
+import random
+from array import array
+
+from simulations.maze import MazeSimulation, TOP, RIGHT, BOTTOM, LEFT, WALLS, VISITED, OPPOSITE, VISIT_ALL
+
+'''
+    Interchangeable maze generators working on the grid of a MazeSimulation (one byte per cell,
+    see simulations/maze.py). Every generator carves the passages of a perfect maze (exactly one
+    path between any two cells) into the grid and marks every cell visited, drawing its random
+    numbers from the random number generator of the maze:
+
+        maze = create_maze(100, 100, 'kruskal', seed=42)
+'''
+
+'''
+    Base class of the maze generators
+'''
+class MazeAlgorithm:
+    name = ''
+
+    '''
+        Carves a whole maze into the grid of the given MazeSimulation
+    '''
+    def generate(self, maze):
+        raise NotImplementedError
+
+
+'''
+    Iterative recursive backtracker (depth first search with an explicit stack), the
+        generator of the challenge
+'''
+class Backtracker(MazeAlgorithm):
+    name = 'backtracker'
+
+    def generate(self, maze):
+        maze.generate()
+
+
+'''
+    Randomized Kruskal: removes the walls in a random order, unless the cells on both sides
+        are already connected, which is checked with a union-find (4 bytes per cell)
+'''
+class Kruskal(MazeAlgorithm):
+    name = 'kruskal'
+
+    def generate(self, maze):
+        grid, rows, cols = maze.grid, maze.rows, maze.cols
+        count = rows * cols
+        last_column = rows * (cols - 1)
+
+        # Every wall between two cells, as cell * 2 for the top wall and cell * 2 + 1 for the right wall
+        edges = array('I')
+        for cell in range(count):
+            if (cell + 1) % rows != 0:
+                edges.append(cell * 2)
+            if cell < last_column:
+                edges.append(cell * 2 + 1)
+        maze.rng.shuffle(edges)
+
+        # Each cell starts in its own set
+        parent = array('I', range(count))
+        remaining = count - 1
+
+        for edge in edges:
+            if remaining == 0:
+                break
+            cell = edge >> 1
+            other = cell + rows if edge & 1 else cell + 1
+
+            # Find the root of both sets (with path halving)
+            a = cell
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            b = other
+            while parent[b] != b:
+                parent[b] = parent[parent[b]]
+                b = parent[b]
+
+            # Only remove the wall if the cells are not connected yet
+            if a != b:
+                parent[a] = b
+                if edge & 1:
+                    grid[cell] &= ~RIGHT
+                    grid[other] &= ~LEFT
+                else:
+                    grid[cell] &= ~TOP
+                    grid[other] &= ~BOTTOM
+                remaining -= 1
+
+        grid[:] = grid.translate(VISIT_ALL)
+
+
+'''
+    Randomized Prim: grows the maze from a random cell, connecting a random cell of the
+        frontier (the unvisited cells next to the maze) to the maze at each step
+'''
+class Prim(MazeAlgorithm):
+    name = 'prim'
+
+    def generate(self, maze):
+        grid = maze.grid
+        get_neighbors, randrange = maze.get_neighbors, maze.rng.randrange
+        in_frontier = bytearray(len(grid))
+        frontier = array('I')
+
+        cell = randrange(len(grid))
+        while True:
+            grid[cell] |= VISITED
+
+            # Add the unvisited neighbors of the new cell to the frontier
+            for wall, neighbor in get_neighbors(cell):
+                if not grid[neighbor] & VISITED and not in_frontier[neighbor]:
+                    in_frontier[neighbor] = 1
+                    frontier.append(neighbor)
+
+            if not frontier:
+                break
+
+            # Pick a random cell of the frontier (swap remove)
+            k = randrange(len(frontier))
+            cell = frontier[k]
+            frontier[k] = frontier[-1]
+            frontier.pop()
+
+            # Connect it to a random neighbor already in the maze
+            visited = [(wall, neighbor) for wall, neighbor in get_neighbors(cell) if grid[neighbor] & VISITED]
+            wall, neighbor = visited[randrange(len(visited))]
+            grid[cell] &= ~wall
+            grid[neighbor] &= ~OPPOSITE[wall]
+
+
+'''
+    Wilson: adds loop-erased random walks to the maze until every cell is in it, which gives
+        a maze picked uniformly among all the possible mazes
+'''
+class Wilson(MazeAlgorithm):
+    name = 'wilson'
+
+    def generate(self, maze):
+        grid, rows = maze.grid, maze.rows
+        get_neighbors, randrange = maze.get_neighbors, maze.rng.randrange
+        offsets = {TOP: 1, RIGHT: rows, BOTTOM: -1, LEFT: -rows}
+
+        # Wall through which the walk last left each cell (erases the loops of the walk)
+        directions = bytearray(len(grid))
+
+        grid[randrange(len(grid))] |= VISITED
+        for start in range(len(grid)):
+            # Walk randomly until the walk reaches the maze
+            cell = start
+            while not grid[cell] & VISITED:
+                neighbors = get_neighbors(cell)
+                wall, cell_next = neighbors[randrange(len(neighbors))]
+                directions[cell] = wall
+                cell = cell_next
+
+            # Carve the walk without its loops, following the last exit of each cell
+            cell = start
+            while not grid[cell] & VISITED:
+                wall = directions[cell]
+                cell_next = cell + offsets[wall]
+                grid[cell] = (grid[cell] & ~wall) | VISITED
+                grid[cell_next] &= ~OPPOSITE[wall]
+                cell = cell_next
+
+
+'''
+    Eller: builds the maze one row at a time, only keeping track of the set of each cell of the
+        current row, so the memory used only depends on the width of the maze
+'''
+class Eller(MazeAlgorithm):
+    name = 'eller'
+
+    def generate(self, maze):
+        grid, rows = maze.grid, maze.rows
+        for j, row in enumerate(self.rows(maze.rows, maze.cols, maze.rng)):
+            # The cells of row j are every rows-th byte of the grid, starting at j
+            grid[j::rows] = row.translate(VISIT_ALL)
+
+    '''
+        Generates the rows of a maze from the bottom to the top, each row being a bytearray
+            with the walls of each of its cells, from left to right, with the given random.Random
+            (a new one when None)
+    '''
+    def rows(self, height, width, rng=None):
+        rng = rng if rng is not None else random.Random()
+        randrange, getrandbits = rng.randrange, rng.getrandbits
+        sets = list(range(width))   # set of each cell of the current row
+        next_set = width    # id of the next new set
+        carved = bytearray(width)   # cells of the current row connected to the row below
+
+        for j in range(height):
+            last = j == height - 1
+            row = bytearray([WALLS]) * width
+
+            # Open the bottom walls of the cells connected to the row below
+            members = {}
+            for i in range(width):
+                if carved[i]:
+                    row[i] &= ~BOTTOM
+                members.setdefault(sets[i], []).append(i)
+
+            # Randomly connect adjacent cells of different sets (all of them on the last row)
+            for i in range(width - 1):
+                a, b = sets[i], sets[i + 1]
+                if a != b and (last or getrandbits(1)):
+                    row[i] &= ~RIGHT
+                    row[i + 1] &= ~LEFT
+                    # Merge the smaller set into the bigger one
+                    if len(members[a]) < len(members[b]):
+                        a, b = b, a
+                    for k in members[b]:
+                        sets[k] = a
+                    members[a].extend(members.pop(b))
+
+            # Connect at least one cell of each set to the row above
+            carved = bytearray(width)
+            if not last:
+                for cells in members.values():
+                    first = cells[randrange(len(cells))]
+                    for k in cells:
+                        if k == first or getrandbits(1):
+                            row[k] &= ~TOP
+                            carved[k] = 1
+
+                # Cells not connected to the row below start in a new set
+                for i in range(width):
+                    if not carved[i]:
+                        sets[i] = next_set
+                        next_set += 1
+
+            yield row
+
+
+ALGORITHMS = {algorithm.name: algorithm for algorithm in [Backtracker, Kruskal, Prim, Wilson, Eller]}
+
+'''
+    Creates a maze of the given size with the algorithm of the given name, the same seed always
+        giving the same maze
+'''
+def create_maze(rows, cols, algorithm='backtracker', seed=None):
+    maze = MazeSimulation(rows, cols, seed=seed)
+    ALGORITHMS[algorithm]().generate(maze)
+    return maze
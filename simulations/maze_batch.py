@@ -0,0 +1,111 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from simulations.maze_algorithms import ALGORITHMS, create_maze
+from simulations.maze_file import save_maze
+from simulations.maze_stream import stream_maze
+
+'''
+    Generates batches of seeded mazes on all the cores, and saves each of them in the format of
+    simulations/maze_file.py. A maze only depends on its job, not on the worker generating it or on
+    the number of workers, so the same jobs always give the same files:
+
+        python -m simulations.maze_batch --seeds 0-999 --rows 100 --cols 100 --algorithm kruskal --output levels
+        python -m simulations.maze_batch --jobs jobs.json --output levels
+
+    where jobs.json is a list of {"seed": 1, "rows": 100, "cols": 100, "algorithm": "prim"} objects
+'''
+
+Job = namedtuple('Job', ['seed', 'rows', 'cols', 'algorithm'])
+
+'''
+    Returns the name of the file of a job
+'''
+def get_file_name(job):
+    return 'maze_{}_{}x{}_{}.maze'.format(job.seed, job.rows, job.cols, job.algorithm)
+
+'''
+    Generates the maze of a job and saves it in the output directory (runs in the workers)
+'''
+def generate_job(job, output):
+    # Every maze has its own random number generator seeded with the seed of the job, so the maze
+    #   doesn't depend on the jobs the worker ran before
+    path = os.path.join(output, get_file_name(job))
+    if job.algorithm == 'eller':
+        # Eller's algorithm can write the rows as they are generated
+        with open(path, 'wb') as f:
+            stream_maze(f, job.rows, job.cols, job.seed)
+    else:
+        save_maze(create_maze(job.rows, job.cols, job.algorithm, job.seed), path)
+    return path
+
+'''
+    Generates the mazes of all the jobs with the given number of processes (all the cores by default),
+        and returns the paths of the maze files in the order of the jobs
+'''
+def run_batch(jobs, output, workers=None):
+    os.makedirs(output, exist_ok=True)
+    jobs = list(jobs)
+    for job in jobs:
+        if job.algorithm not in ALGORITHMS:
+            raise ValueError('unknown maze algorithm {!r}'.format(job.algorithm))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Send the jobs by chunks, so that small mazes don't spend more time in the queue than generating
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 4))
+        return list(executor.map(generate_job, jobs, [output] * len(jobs), chunksize=chunksize))
+
+'''
+    Parses a range of seeds like '0-999' or a single seed like '42'
+'''
+def parse_seeds(seeds):
+    if '-' in seeds:
+        first, last = seeds.split('-')
+        return range(int(first), int(last) + 1)
+    return [int(seeds)]
+
+'''
+    Reads the jobs of a JSON file
+'''
+def read_jobs(path):
+    with open(path) as f:
+        return [Job(job['seed'], job['rows'], job['cols'], job.get('algorithm', 'backtracker'))
+                for job in json.load(f)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generates seeded mazes in parallel')
+    parser.add_argument('--jobs', help='JSON file with the list of jobs')
+    parser.add_argument('--seeds', help='range of seeds, like 0-999 (instead of --jobs)')
+    parser.add_argument('--rows', type=int, default=100, help='number of rows of the mazes (with --seeds)')
+    parser.add_argument('--cols', type=int, default=100, help='number of columns of the mazes (with --seeds)')
+    parser.add_argument('--algorithm', default='backtracker', choices=list(ALGORITHMS),
+                        help='maze generator (with --seeds)')
+    parser.add_argument('--workers', type=int, help='number of processes, all the cores by default')
+    parser.add_argument('--output', required=True, help='directory where the mazes are saved')
+    args = parser.parse_args(argv)
+
+    if args.jobs:
+        jobs = read_jobs(args.jobs)
+    elif args.seeds:
+        jobs = [Job(seed, args.rows, args.cols, args.algorithm) for seed in parse_seeds(args.seeds)]
+    else:
+        parser.error('either --jobs or --seeds is required')
+
+    start = time.perf_counter()
+    paths = run_batch(jobs, args.output, args.workers)
+    duration = time.perf_counter() - start
+
+    cells = sum(job.rows * job.cols for job in jobs)
+    print('{} mazes in {:.2f} s: {:.1f} mazes/s, {:.0f} cells/s'.format(
+        len(paths), duration, len(paths) / duration, cells / duration))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
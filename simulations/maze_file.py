@@ -0,0 +1,223 @@
+import mmap
+import os
+import struct
+
+from simulations.maze import MazeSimulation, TOP, RIGHT, BOTTOM, LEFT, WALLS, VISIT_ALL
+
+'''
+    Binary file format of the mazes:
+
+        - header: the magic bytes b'MAZE', the version of the format (1 byte), then the number of
+          rows and the number of columns (4 bytes each, little endian)
+        - then the rows of the maze from the bottom to the top, each row being the walls of its cells
+          from left to right, packed two cells per byte (the first cell in the low 4 bits, the second
+          cell in the high 4 bits, with the wall bits of simulations/maze.py)
+
+    Every row takes the same number of bytes, so the row j starts at HEADER_SIZE + j * row_size(cols),
+    and a MazeFile can read any cell or region of the maze through mmap without parsing the file:
+
+        save_maze(maze, 'level.maze')
+        with MazeFile('level.maze') as maze_file:
+            walls = maze_file.cell(10, 20)
+'''
+
+MAGIC = b'MAZE'
+VERSION = 1
+HEADER = struct.Struct('<4sBII')
+HEADER_SIZE = HEADER.size
+
+# Table moving the walls of a cell to the high 4 bits of a byte, for bytes.translate
+HIGH_WALLS = bytes(((cell & WALLS) << 4) & 0xFF for cell in range(256))
+# Tables extracting the walls of the first and the second cell of a packed byte
+LOW_CELL = bytes(byte & WALLS for byte in range(256))
+HIGH_CELL = bytes(byte >> 4 for byte in range(256))
+
+'''
+    Returns the number of bytes of a row of cols cells
+'''
+def row_size(cols):
+    return (cols + 1) // 2
+
+'''
+    Returns the header of a maze of the given size
+'''
+def pack_header(rows, cols):
+    return HEADER.pack(MAGIC, VERSION, rows, cols)
+
+'''
+    Reads a header and returns the number of rows and columns of the maze
+'''
+def unpack_header(data):
+    if len(data) < HEADER_SIZE:
+        raise ValueError('not a maze file')
+    magic, version, rows, cols = HEADER.unpack(bytes(data[:HEADER_SIZE]))
+    if magic != MAGIC:
+        raise ValueError('not a maze file')
+    if version != VERSION:
+        raise ValueError('unsupported maze file version {}'.format(version))
+    return rows, cols
+
+'''
+    Packs a row of cells (one byte per cell) two cells per byte
+'''
+def pack_row(row):
+    low = bytes(row[0::2]).translate(LOW_CELL)
+    high = bytes(row[1::2]).translate(HIGH_WALLS)
+    if len(high) < len(low):
+        high += b'\0'
+    # OR the two halves byte by byte, using big integers to do it in C
+    return (int.from_bytes(low, 'little') | int.from_bytes(high, 'little')).to_bytes(len(low), 'little')
+
+'''
+    Unpacks a packed row into one byte per cell (walls only)
+'''
+def unpack_row(data, cols):
+    data = bytes(data)
+    row = bytearray(cols)
+    row[0::2] = data.translate(LOW_CELL)[:(cols + 1) // 2]
+    row[1::2] = data.translate(HIGH_CELL)[:cols // 2]
+    return row
+
+'''
+    Writes a maze to a binary file object one row at a time, as the rows are generated, so that the
+        whole maze never has to be in memory
+'''
+class MazeWriter:
+    def __init__(self, file, rows, cols):
+        self.file = file
+        self.rows = rows
+        self.cols = cols
+        self.rows_written = 0
+        file.write(pack_header(rows, cols))
+
+    '''
+        Writes the next row of the maze (one byte per cell, from left to right)
+    '''
+    def write_row(self, row):
+        if self.rows_written == self.rows:
+            raise ValueError('all the rows of the maze were already written')
+        if len(row) != self.cols:
+            raise ValueError('a row has {} cells, not {}'.format(self.cols, len(row)))
+        self.file.write(pack_row(row))
+        self.rows_written += 1
+
+'''
+    Reads a maze file row by row, and yields each row as one byte per cell (walls only)
+'''
+def read_rows(file):
+    rows, cols = unpack_header(file.read(HEADER_SIZE))
+    size = row_size(cols)
+    for j in range(rows):
+        data = file.read(size)
+        if len(data) != size:
+            raise ValueError('the maze file is truncated at row {}'.format(j))
+        yield unpack_row(data, cols)
+
+'''
+    Saves a MazeSimulation to a maze file
+'''
+def save_maze(maze, path):
+    with open(path, 'wb') as f:
+        writer = MazeWriter(f, maze.rows, maze.cols)
+        for j in range(maze.rows):
+            # The cells of row j are every rows-th byte of the grid, starting at j
+            writer.write_row(maze.grid[j::maze.rows])
+
+'''
+    Loads a whole maze file into a MazeSimulation, where every cell is visited
+'''
+def load_maze(path):
+    with MazeFile(path) as maze_file:
+        maze = MazeSimulation(maze_file.rows, maze_file.cols)
+        for j in range(maze.rows):
+            maze.grid[j::maze.rows] = maze_file.row(j).translate(VISIT_ALL)
+    return maze
+
+'''
+    Loads the region of a maze file starting at column i and row j, that is cols wide and rows high
+        (clipped to the maze), into a MazeSimulation where every cell is visited
+'''
+def load_region(path, i, j, cols, rows):
+    with MazeFile(path) as maze_file:
+        region = maze_file.region(i, j, cols, rows)
+    maze = MazeSimulation(len(region), len(region[0]))
+    for row_index, row in enumerate(region):
+        maze.grid[row_index::maze.rows] = row.translate(VISIT_ALL)
+
+    # The cells on the border of the region can have walls open towards the cells left out of it:
+    #   close them, since the solvers rely on the border of a maze being closed
+    grid, rows = maze.grid, maze.rows
+    for index in range(0, len(grid), rows):
+        grid[index] |= BOTTOM
+        grid[index + rows - 1] |= TOP
+    for index in range(rows):
+        grid[index] |= LEFT
+        grid[len(grid) - rows + index] |= RIGHT
+    return maze
+
+'''
+    Read only view of a maze file through mmap: only the parts of the file that are read are
+        loaded in memory, and the pages are shared by all the processes opening the same file
+'''
+class MazeFile:
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = None
+        try:
+            # an empty file can't be mapped, and it isn't a maze file either
+            if os.fstat(self.file.fileno()).st_size < HEADER_SIZE:
+                raise ValueError('not a maze file')
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.rows, self.cols = unpack_header(self.data)
+            self.row_size = row_size(self.cols)
+            if len(self.data) < HEADER_SIZE + self.rows * self.row_size:
+                raise ValueError('the maze file is truncated')
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self.data is not None:
+            self.data.close()
+        self.file.close()
+
+    '''
+        Returns the walls of the cell in column i and row j
+    '''
+    def cell(self, i, j):
+        if not (0 <= i < self.cols and 0 <= j < self.rows):
+            raise IndexError('cell ({}, {}) is out of the maze'.format(i, j))
+        byte = self.data[HEADER_SIZE + j * self.row_size + i // 2]
+        return byte >> 4 if i % 2 else byte & WALLS
+
+    '''
+        Returns the walls of the cells of row j (one byte per cell, from left to right)
+    '''
+    def row(self, j):
+        return self.region(0, j, self.cols, 1)[0]
+
+    '''
+        Returns the walls of the cells of the region starting at column i and row j, that is
+            cols wide and rows high, as one bytearray per row (from the bottom to the top)
+    '''
+    def region(self, i, j, cols, rows):
+        i_end = min(i + cols, self.cols)
+        j_end = min(j + rows, self.rows)
+        if not (0 <= i < i_end and 0 <= j < j_end):
+            raise IndexError('the region is out of the maze')
+
+        # Only read the bytes containing the region, starting on an even column
+        first_byte = i // 2
+        last_byte = (i_end + 1) // 2
+        region = []
+        for row_index in range(j, j_end):
+            start = HEADER_SIZE + row_index * self.row_size
+            cells = unpack_row(self.data[start + first_byte:start + last_byte], (last_byte - first_byte) * 2)
+            region.append(cells[i - first_byte * 2:i_end - first_byte * 2])
+        return region
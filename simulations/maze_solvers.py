@@ -0,0 +1,184 @@
+import heapq
+from array import array
+
+from simulations.maze import TOP, RIGHT, BOTTOM, LEFT, WALLS
+
+'''
+    Maze solvers working directly on the grid of a MazeSimulation (one byte per cell, see
+    simulations/maze.py). Every solver returns the path from the start cell to the goal cell
+    (a list of cell indices, empty if the goal can't be reached) and the number of cells it visited:
+
+        path, visited = SOLVERS['astar']().solve(maze)
+
+    By default the start is the bottom left cell and the goal is the top right cell.
+'''
+
+# Walls of a cell, in the order the solvers try them
+DIRECTIONS = (TOP, RIGHT, BOTTOM, LEFT)
+# Number of open walls of a cell, for bytearray.translate
+OPEN_WALLS = bytes(4 - bin(cell & WALLS).count('1') for cell in range(256))
+# Marks the start cell in the came_from arrays (not a wall bit)
+START = 16
+
+'''
+    Returns the index moves through each wall of a cell
+'''
+def get_offsets(maze):
+    return {TOP: 1, RIGHT: maze.rows, BOTTOM: -1, LEFT: -maze.rows}
+
+'''
+    Rebuilds the path to the goal from the wall through which each cell was entered
+'''
+def rebuild_path(came_from, offsets, goal):
+    path = [goal]
+    cell = goal
+    while came_from[cell] != START:
+        cell -= offsets[came_from[cell]]
+        path.append(cell)
+    path.reverse()
+    return path
+
+'''
+    Base class of the maze solvers
+'''
+class MazeSolver:
+    name = ''
+
+    '''
+        Returns the path from start to goal and the number of visited cells
+    '''
+    def solve(self, maze, start=0, goal=None):
+        raise NotImplementedError
+
+
+'''
+    Breadth first search, with a queue allocated once for the whole grid (4 bytes per cell)
+        and the wall through which each cell was entered (1 byte per cell)
+'''
+class BFS(MazeSolver):
+    name = 'bfs'
+
+    def solve(self, maze, start=0, goal=None):
+        grid = maze.grid
+        goal = len(grid) - 1 if goal is None else goal
+        offsets = get_offsets(maze)
+        moves = [(wall, offsets[wall]) for wall in DIRECTIONS]
+
+        came_from = bytearray(len(grid))
+        came_from[start] = START
+        queue = array('I', [0]) * len(grid)
+        queue[0] = start
+        head, tail = 0, 1
+
+        while head < tail:
+            cell = queue[head]
+            head += 1
+            if cell == goal:
+                return rebuild_path(came_from, offsets, goal), head
+            walls = grid[cell]
+            for wall, offset in moves:
+                # the walls on the border of the maze are never removed, so there is no bounds check
+                if not walls & wall:
+                    neighbor = cell + offset
+                    if not came_from[neighbor]:
+                        came_from[neighbor] = wall
+                        queue[tail] = neighbor
+                        tail += 1
+        return [], head
+
+
+'''
+    A*, with a binary heap ordered by the distance walked plus the Manhattan distance to the goal
+'''
+class AStar(MazeSolver):
+    name = 'astar'
+
+    def solve(self, maze, start=0, goal=None):
+        grid, rows = maze.grid, maze.rows
+        goal = len(grid) - 1 if goal is None else goal
+        goal_i, goal_j = goal // rows, goal % rows
+        offsets = get_offsets(maze)
+        moves = [(wall, offsets[wall]) for wall in DIRECTIONS]
+        push, pop = heapq.heappush, heapq.heappop
+
+        came_from = bytearray(len(grid))
+        came_from[start] = START
+        # distance walked from the start to each cell (4 bytes per cell)
+        distances = array('I', [0xFFFFFFFF]) * len(grid)
+        distances[start] = 0
+        heap = [(0, 0, start)]
+        visited = 0
+
+        while heap:
+            _, distance, cell = pop(heap)
+            if distance > distances[cell]:
+                # a shorter way to this cell was already found
+                continue
+            visited += 1
+            if cell == goal:
+                return rebuild_path(came_from, offsets, goal), visited
+            walls = grid[cell]
+            distance += 1
+            for wall, offset in moves:
+                if not walls & wall:
+                    neighbor = cell + offset
+                    if distance < distances[neighbor]:
+                        distances[neighbor] = distance
+                        came_from[neighbor] = wall
+                        estimate = abs(neighbor // rows - goal_i) + abs(neighbor % rows - goal_j)
+                        push(heap, (distance + estimate, distance, neighbor))
+        return [], visited
+
+
+'''
+    Dead end filling: fills every dead end (a cell with a single opening) until only the cells on the
+        path are left, then walks along them. It only works on perfect mazes (without loops), which is
+        what the generators make
+'''
+class DeadEndFilling(MazeSolver):
+    name = 'dead-end'
+
+    def solve(self, maze, start=0, goal=None):
+        grid = maze.grid
+        goal = len(grid) - 1 if goal is None else goal
+        offsets = get_offsets(maze)
+        moves = [(wall, offsets[wall]) for wall in DIRECTIONS]
+
+        # number of openings of each cell that don't lead to a filled cell
+        openings = grid.translate(OPEN_WALLS)
+        filled = bytearray(len(grid))
+
+        dead_ends = [cell for cell, count in enumerate(openings)
+                     if count <= 1 and cell != start and cell != goal]
+        visited = 0
+        while dead_ends:
+            cell = dead_ends.pop()
+            filled[cell] = 1
+            visited += 1
+            walls = grid[cell]
+            for wall, offset in moves:
+                if not walls & wall:
+                    neighbor = cell + offset
+                    if not filled[neighbor]:
+                        openings[neighbor] -= 1
+                        # filling this cell made its neighbor a dead end
+                        if openings[neighbor] == 1 and neighbor != start and neighbor != goal:
+                            dead_ends.append(neighbor)
+
+        # Walk along the cells that were not filled
+        path = [start]
+        previous, cell = -1, start
+        while cell != goal:
+            walls = grid[cell]
+            for wall, offset in moves:
+                neighbor = cell + offset
+                if not walls & wall and neighbor != previous and not filled[neighbor]:
+                    previous, cell = cell, neighbor
+                    path.append(cell)
+                    break
+            else:
+                return [], visited + len(path)
+        return path, visited + len(path)
+
+
+SOLVERS = {solver.name: solver for solver in [BFS, AStar, DeadEndFilling]}
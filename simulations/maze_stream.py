@@ -0,0 +1,53 @@
+import argparse
+import random
+import sys
+
+from simulations.maze_algorithms import Eller
+from simulations.maze_file import MazeWriter
+
+'''
+    Streaming maze generation: the maze is generated with Eller's algorithm, which only keeps one row
+    in memory, and every row is handed to the consumer (a file or a loop) as soon as it is generated,
+    so the maze can be far bigger than the memory:
+
+        python -m simulations.maze_stream 100000 100000 huge.maze
+        python -m simulations.maze_stream 1000 1000 - | consumer
+'''
+
+'''
+    Generates the rows of a maze from the bottom to the top, each row being a bytearray with
+        the walls of each of its cells from left to right (see simulations/maze.py for the bits)
+'''
+def generate_rows(rows, cols, seed=None):
+    return Eller().rows(rows, cols, random.Random(seed))
+
+'''
+    Generates a maze and writes it row by row to the given binary file object, in the format of
+        simulations/maze_file.py
+'''
+def stream_maze(file, rows, cols, seed=None):
+    writer = MazeWriter(file, rows, cols)
+    for row in generate_rows(rows, cols, seed):
+        writer.write_row(row)
+    return writer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generates a maze row by row and writes it to a file')
+    parser.add_argument('rows', type=int, help='number of rows of the maze')
+    parser.add_argument('cols', type=int, help='number of columns of the maze')
+    parser.add_argument('output', help='maze file to write, - for the standard output')
+    parser.add_argument('--seed', type=int, help='seed of the maze, the same seed always gives the same maze')
+    args = parser.parse_args(argv)
+
+    if args.output == '-':
+        stream_maze(sys.stdout.buffer, args.rows, args.cols, args.seed)
+        sys.stdout.buffer.flush()
+    else:
+        with open(args.output, 'wb') as f:
+            stream_maze(f, args.rows, args.cols, args.seed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
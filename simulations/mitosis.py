@@ -0,0 +1,92 @@
+import math
+
+from simulations.simulation import Simulation
+
+'''
+    Headless version of Coding Challenge #6: Mitosis
+'''
+
+WINDOW_SIZE = (700, 700)
+
+'''
+    Calculates the euclidian distance between two points (x1, y1) and (x2, y2)
+'''
+def distance(x1, y1, x2, y2):
+    return math.sqrt(math.pow(x1 - x2, 2) + math.pow(y1 - y2, 2))
+
+'''
+    Class vibrating the cells and splitting them when they are clicked
+'''
+class MitosisSimulation(Simulation):
+    TIME = 0.1  # Update time (The smaller, the faster the cells vibrate)
+    CELL_SIZE = 50  # Diameter of the initial cell
+
+    def __init__(self, window_size=WINDOW_SIZE, num_cells=2, seed=None, rng=None):
+        super(MitosisSimulation, self).__init__(seed, rng)
+        self.window_size = window_size
+
+        # Create two cells to start
+        self.cells = [Cell(window_size, self.CELL_SIZE, self.rng) for i in range(num_cells)]
+
+    '''
+        This method vibrates the cells
+    '''
+    def tick(self):
+        for cell in self.cells:
+            cell.move()
+
+    '''
+        This method splits each cell containing the point (x, y) into two cells of smaller size
+    '''
+    def click(self, x, y):
+        for i in range(len(self.cells) - 1, -1, -1):
+            if self.cells[i].isClicked(x, y):
+                # Split the clicked cell into cell_A and cell_B, then erase the actual cell
+                cell_A, cell_B = self.cells[i].split()
+                self.cells.append(cell_A)
+                self.cells.append(cell_B)
+                self.cells.remove(self.cells[i])
+
+'''
+    Class representing a cell object and the behaviours associated with it
+        (move, check whether or not the cell is clicked, etc)
+'''
+class Cell:
+    def __init__(self, window_size, r, rng):
+        self.window_size = window_size
+        # random number generator of the simulation
+        self.rng = rng
+        # Create the cell at a random location
+        self.x = rng.uniform(r, window_size[0] - r)
+        self.y = rng.uniform(r, window_size[1] - r)
+        # random color between pink and purple
+        self.rgb = (rng.uniform(0.39, 1), 0, rng.uniform(0.39, 1))
+        self.r = r
+
+    # Move the cell by a small vector (dx, dy)
+    def move(self):
+        d = min(self.x, self.y) / 100
+        dx = self.rng.uniform(-d, d)
+        dy = self.rng.uniform(-d, d)
+        self.x += dx
+        self.y += dy
+
+    # Split the cell into two small cells
+    def split(self):
+        cell_A = Cell(self.window_size, self.r, self.rng)
+        cell_A.x = self.x + self.r / 2
+        cell_A.y = self.y
+        cell_A.rgb = self.rgb
+        cell_A.r = self.r * 0.8
+
+        cell_B = Cell(self.window_size, self.r, self.rng)
+        cell_B.x = self.x - self.r / 2
+        cell_B.y = self.y
+        cell_B.rgb = self.rgb
+        cell_B.r = self.r * 0.8
+
+        return cell_A, cell_B
+
+    # Given the nouse location, checks whether or not the cell was clicked
+    def isClicked(self, mouse_x, mouse_y):
+        return distance(self.x, self.y, mouse_x, mouse_y) < self.r
@@ -0,0 +1,227 @@
+import numpy as np
+
+from simulations.simulation import Simulation
+
+'''
+    Headless version of Coding Challenge #4: Purple Rain
+'''
+
+WINDOW_SIZE = (640, 360)
+NUM_DROPS = 100
+SPLASH_TICKS = 1  # Number of ticks during which a splash is shown
+DEPTH_RANGE = (0, 20)  # Depths of the drops (the farthest, then the closest to the screen)
+DEPTH_RESOLUTION = 21  # Number of depths in the range that a drop can have
+
+'''
+    Maps the number x from the range [x1, x2] to a corresponding number in the range [y1, y2]
+        (works on a single number or an array of numbers)
+'''
+def map(x, x1, x2, y1, y2):
+    return y1 + x * (y2 - y1) / (x2 - x1)
+
+'''
+    Class that makes the drops fall
+'''
+class RainSimulation(Simulation):
+    TIME = 0.05
+
+    def __init__(self, width=WINDOW_SIZE[0], height=WINDOW_SIZE[1], num_drops=NUM_DROPS, seed=None, rng=None,
+                 depths=None):
+        super(RainSimulation, self).__init__(seed, rng)
+        self.size = (width, height)
+
+        # parameters of the drops at each depth
+        self.depths = depths if depths is not None else DepthTable()
+
+        # numpy generator for the random numbers drawn for many drops at once, seeded from self.rng
+        #   so that the seed of the simulation also sets it
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        # create the drops
+        self.store = DropStore(num_drops)
+        self.create_drops()
+
+        # the splashes of the drops that hit the bottom, kept for SPLASH_TICKS ticks (a drop hits the
+        #   bottom at most once per tick, so there is never more than num_drops splashes per tick)
+        self.splashes = SplashRing(num_drops * SPLASH_TICKS)
+        self.splash_tick = 0
+
+    '''
+        Picks a random location for every drop, out of the screen
+    '''
+    def create_drops(self):
+        store = self.store
+        count = len(store)
+        width, height = self.size
+
+        store.x[:] = self.np_rng.integers(0, width + 1, count)
+        store.y[:] = self.np_rng.integers(height, height + 501, count)  # the drop will start out of the screen
+
+        # The closer to the screen, the higher the gravity, the faster the drop is, the
+        #   longer and thicker it is as well
+        depths = self.depths
+        levels = depths.random_depths(self.np_rng, count)
+        store.z[:] = depths.depth(levels)  # represents the depth (in an attempt to make the simulation 3D)
+        store.gravity[:] = depths.lookup(depths.gravity, levels)
+        store.yspeed[:] = depths.lookup(depths.yspeed, levels)
+        store.length[:] = depths.lookup(depths.length, levels)
+        store.thickness[:] = depths.lookup(depths.thickness, levels)
+
+    '''
+        Moves all the drops down, and relocates the drops that hit the bottom after creating their splash
+    '''
+    def tick(self):
+        store = self.store
+        self.splash_tick += 1
+
+        # Move the drops down faster with gravity
+        store.y -= store.yspeed
+        store.yspeed += store.gravity
+
+        # The drops that hit the bottom splash, then are relocated
+        hit = store.y - store.length < 0
+        count = int(np.count_nonzero(hit))
+        if count == 0:
+            return
+        self.splashes.add(store.x[hit], store.length[hit], store.thickness[hit], self.splash_tick)
+
+        # relocating (only the location, the depth and the speed change, like in the original sketch)
+        height = self.size[1]
+        depths = self.depths
+        store.y[hit] = self.np_rng.integers(height, height + 101, count)
+        levels = depths.random_depths(self.np_rng, count)
+        store.z[hit] = depths.depth(levels)
+        store.yspeed[hit] = depths.lookup(depths.yspeed, levels)
+
+    '''
+        Returns the lines of the drops, as an array of (x1, y1, x2, y2) rows
+    '''
+    def get_lines(self):
+        store = self.store
+        return np.stack((store.x, store.y, store.x, store.y - store.length), axis=1)
+
+    '''
+        Returns the lines of the splashes shown, as an array of (x1, y1, x2, y2) rows (two lines per splash),
+            and the thickness of each line
+    '''
+    def get_splashlines(self):
+        return self.splashes.get_lines(self.splash_tick - SPLASH_TICKS)
+
+
+'''
+    Tables of the parameters of the drops at each depth, computed once instead of for every drop
+
+    The depths range from min_depth to max_depth, with resolution evenly spaced depths. By default a
+    drop is at one of these depths, drawn as the index of the depth, so its parameters are read from
+    the tables with that index. When continuous is True, a drop can be at any depth of the range,
+    drawn as a fractional index, and its parameters are interpolated between the two closest depths
+'''
+class DepthTable:
+    def __init__(self, min_depth=DEPTH_RANGE[0], max_depth=DEPTH_RANGE[1], resolution=DEPTH_RESOLUTION,
+                 continuous=False):
+        if resolution < 2:
+            raise ValueError('the resolution of the depths must be at least 2')
+        self.continuous = continuous
+        self.depths = np.linspace(min_depth, max_depth, resolution)
+
+        # The closer to the screen, the higher the gravity, the faster the drop is, the
+        #   longer and thicker it is as well
+        z = self.depths - min_depth
+        self.gravity = map(z, 0, max_depth - min_depth, 0, 0.5)
+        self.yspeed = map(z, 0, max_depth - min_depth, 4, 10)
+        self.length = map(z, 0, max_depth - min_depth, 10, 20)
+        self.thickness = map(z, 0, max_depth - min_depth, 1, 1.5)
+
+    '''
+        Returns the indices (fractional ones if the depths are continuous) of count random depths
+    '''
+    def random_depths(self, np_rng, count):
+        if self.continuous:
+            return np_rng.uniform(0, len(self.depths) - 1, count)
+        return np_rng.integers(0, len(self.depths), count)
+
+    '''
+        Returns the depths at the given indices
+    '''
+    def depth(self, indices):
+        return self.lookup(self.depths, indices)
+
+    '''
+        Returns the values of the table at the given indices, interpolated between the two closest
+            values if the depths are continuous
+    '''
+    def lookup(self, table, indices):
+        if self.continuous:
+            return np.interp(indices, np.arange(len(table)), table)
+        return table[indices]
+
+
+'''
+    The parameters of all the drops in numpy arrays, so that they all fall at once
+'''
+class DropStore:
+    def __init__(self, count):
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.z = np.zeros(count)
+        self.yspeed = np.zeros(count)
+        self.gravity = np.zeros(count)
+        self.length = np.zeros(count)
+        self.thickness = np.zeros(count)
+
+    def __len__(self):
+        return len(self.x)
+
+
+'''
+    Splashes (two lines in symmetric and diagonal directions) stored in a ring buffer of numpy arrays:
+        the new splashes are written over the oldest ones, and a splash is shown until SPLASH_TICKS
+        ticks after the tick it was created
+'''
+class SplashRing:
+    def __init__(self, capacity):
+        self.x = np.zeros(capacity)
+        self.length = np.zeros(capacity)
+        self.thickness = np.zeros(capacity)
+        # tick during which each splash was created (0 is before the first tick)
+        self.tick = np.zeros(capacity, dtype=np.int64)
+        # index where the next splash is written
+        self.head = 0
+
+    def __len__(self):
+        return len(self.x)
+
+    '''
+        Adds the splashes of drops at the bottom of the window, with the given drops lengths and thicknesses
+    '''
+    def add(self, x, drop_length, thickness, tick):
+        capacity = len(self)
+        count = len(x)
+        if count > capacity:
+            x, drop_length, thickness = x[-capacity:], drop_length[-capacity:], thickness[-capacity:]
+            count = capacity
+        indices = (self.head + np.arange(count)) % capacity
+        self.x[indices] = x
+        # the splash lines length are proportional to the drop length, but smaller
+        self.length[indices] = drop_length / 15
+        self.thickness[indices] = thickness
+        self.tick[indices] = tick
+        self.head = (self.head + count) % capacity
+
+    '''
+        Returns the lines of the splashes created after the given tick, as an array of (x1, y1, x2, y2)
+            rows (two lines per splash), and the thickness of each line
+    '''
+    def get_lines(self, after_tick):
+        shown = self.tick > after_tick
+        x = self.x[shown]
+        length = self.length[shown]
+        lines = np.empty((len(x), 2, 4))
+        # make the splash lines inclined and symmetric
+        lines[:, 0, 0] = x + 5
+        lines[:, 0, 2] = x + 5 + length
+        lines[:, 1, 0] = x - 5
+        lines[:, 1, 2] = x - 5 - length
+        lines[:, :, 1] = 10
+        lines[:, :, 3] = (10 + length)[:, None]
+        return lines.reshape(-1, 4), np.repeat(self.thickness[shown], 2)
@@ -0,0 +1,156 @@
+import argparse
+import struct
+import sys
+import time
+
+from simulations.snake import SnakeSimulation
+from simulations.space_invaders import SpaceInvadersSimulation
+
+'''
+    Replays of the games played with the keyboard: the seed of the game and every key event, with
+    the tick during which it happened, are recorded in a small binary file, and the game can then be
+    simulated again without kivy (and much faster than real time) from the replay alone:
+
+        python -m simulations.replay game.replay
+
+    Binary format of the replays:
+
+        - header: the magic bytes b'RPLY', the version of the format (1 byte), the game (1 byte, its
+          index in GAMES), the seed of the simulation (8 bytes), then the width and the height of the
+          window (4 bytes each), little endian
+        - then the events in the order they happened, 6 bytes each: the number of ticks run before the
+          event (4 bytes), the type of the event (PRESS, RELEASE or END) and the key (its index in KEYS,
+          or OTHER_KEY for any other key)
+
+    The END event is written when the recording stops, with the number of ticks of the game.
+'''
+
+MAGIC = b'RPLY'
+VERSION = 1
+HEADER = struct.Struct('<4sBBQII')
+EVENT = struct.Struct('<IBB')
+
+# Games that can be recorded, with the simulation of each game
+GAMES = ('snake', 'space_invaders')
+SIMULATIONS = {'snake': SnakeSimulation, 'space_invaders': SpaceInvadersSimulation}
+
+# Types of the events
+PRESS, RELEASE, END = 0, 1, 2
+
+# Keys used by the games. The other keys are all recorded as OTHER_KEY: the games only check
+#   whether or not a key is one of theirs, so they behave the same with any other key
+KEYS = ('w', 'a', 's', 'd', 'up', 'left', 'down', 'right', 'spacebar', 'enter')
+OTHER_KEY = 255
+OTHER_KEY_NAME = 'other'
+KEY_CODES = {key: code for code, key in enumerate(KEYS)}
+
+'''
+    Creates the simulation of a game
+'''
+def create_game(game, seed, width, height):
+    return SIMULATIONS[game](width, height, seed=seed)
+
+'''
+    Writes the replay of a game to a binary file object, one event at a time
+'''
+class ReplayWriter:
+    def __init__(self, file, game, seed, width, height):
+        self.file = file
+        file.write(HEADER.pack(MAGIC, VERSION, GAMES.index(game), seed, width, height))
+
+    def write_event(self, tick, event, key=None):
+        code = OTHER_KEY if key is None else KEY_CODES.get(key, OTHER_KEY)
+        self.file.write(EVENT.pack(tick, event, code))
+
+'''
+    Sends the key events of the player to a simulation, and records them in a replay file
+'''
+class Recorder:
+    def __init__(self, simulation, path, game, seed):
+        self.simulation = simulation
+        self.file = open(path, 'wb')
+        self.writer = ReplayWriter(self.file, game, seed, *simulation.size)
+
+    def press(self, key):
+        if not self.file.closed:
+            self.writer.write_event(self.simulation.ticks, PRESS, key)
+        self.simulation.press(key)
+
+    def release(self, key):
+        if not self.file.closed:
+            self.writer.write_event(self.simulation.ticks, RELEASE, key)
+        self.simulation.release(key)
+
+    '''
+        Stops the recording (the game can still go on, but it isn't recorded anymore)
+    '''
+    def close(self):
+        if not self.file.closed:
+            self.writer.write_event(self.simulation.ticks, END)
+            self.file.close()
+
+'''
+    Reads a replay file object and returns the game, the seed, the size of the window and the list
+        of events, each event being a (tick, type, key name) tuple
+'''
+def read_replay(file):
+    data = file.read()
+    if len(data) < HEADER.size:
+        raise ValueError('not a replay file')
+    magic, version, game, seed, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError('not a replay file')
+    if version != VERSION:
+        raise ValueError('unsupported replay file version {}'.format(version))
+    if game >= len(GAMES):
+        raise ValueError('unknown game {} in the replay file'.format(game))
+
+    events = []
+    # a recording that was interrupted can end with part of an event, which is ignored
+    end = len(data) - (len(data) - HEADER.size) % EVENT.size
+    for tick, event, code in EVENT.iter_unpack(data[HEADER.size:end]):
+        events.append((tick, event, KEYS[code] if code < len(KEYS) else OTHER_KEY_NAME))
+    return GAMES[game], seed, (width, height), events
+
+'''
+    Simulates again the game of a replay file, and returns the simulation at the end of the replay
+        (at the END event, or at the last event if the recording was interrupted)
+'''
+def replay(path):
+    with open(path, 'rb') as f:
+        game, seed, size, events = read_replay(f)
+
+    simulation = create_game(game, seed, *size)
+    for tick, event, key in events:
+        if tick < simulation.ticks:
+            raise ValueError('the events of the replay file are not in order')
+        simulation.run(tick - simulation.ticks)
+        if event == PRESS:
+            simulation.press(key)
+        elif event == RELEASE:
+            simulation.release(key)
+        elif event == END:
+            break
+    return game, simulation
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Simulates again the game of a replay file')
+    parser.add_argument('replay', help='replay file recorded while playing')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    game, simulation = replay(args.replay)
+    duration = time.perf_counter() - start
+
+    if game == 'snake':
+        result = 'score {}{}'.format(simulation.score(), ', game over' if simulation.game_over else '')
+    else:
+        result = 'aliens killed {}{}'.format(simulation.aliens_killed, ', won' if simulation.won else '')
+    print('{}: {} ticks ({:.1f} s of play) in {:.3f} s, {}'.format(
+        game, simulation.ticks, simulation.ticks * simulation.TIME, duration, result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
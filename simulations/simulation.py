@@ -0,0 +1,69 @@
+import random
+
+'''
+    Returns the point at the fraction alpha of the way from the point previous to the point current,
+        to draw an entity between the locations it had before and after the last tick
+'''
+def interpolate(previous, current, alpha):
+    return (previous[0] + (current[0] - previous[0]) * alpha,
+            previous[1] + (current[1] - previous[1]) * alpha)
+
+'''
+    Base class of every headless simulation
+
+    Every simulation draws its random numbers from its own random.Random, so that two simulations
+    never share random state, and a simulation created with the same seed always runs the same way
+'''
+class Simulation:
+    TIME = 0.1  # Duration of a single tick of the simulation, in seconds
+    # Most ticks run by a single step: when the frames are too slow for the simulation, the time that
+    #   doesn't fit is dropped, instead of making the next frames even slower to catch up
+    MAX_TICKS_PER_STEP = 10
+
+    def __init__(self, seed=None, rng=None):
+        # random number generator of the simulation (a new one seeded with seed, unless one is given)
+        self.rng = rng if rng is not None else random.Random(seed)
+        # time passed to step() that was not yet consumed by a tick
+        self.accumulated_time = 0
+        # number of ticks run since the creation of the simulation
+        self.ticks = 0
+
+    '''
+        Advances the simulation by dt seconds, running as many fixed ticks of TIME seconds as
+            fit in the time accumulated so far (at most MAX_TICKS_PER_STEP), and returns the number
+            of ticks run. The game runs at the same speed whatever the frame rate of the caller
+    '''
+    def step(self, dt):
+        self.accumulated_time += dt
+        ticks = 0
+        while self.accumulated_time >= self.TIME:
+            if ticks == self.MAX_TICKS_PER_STEP:
+                self.accumulated_time %= self.TIME
+                break
+            self.accumulated_time -= self.TIME
+            self.tick()
+            ticks += 1
+        self.ticks += ticks
+        return ticks
+
+    '''
+        Returns the fraction of the next tick already accumulated by step(), between 0 and 1, to draw
+            the entities between their locations before and after the last tick when the frames are
+            faster than the ticks
+    '''
+    def interpolation(self):
+        return min(self.accumulated_time / self.TIME, 1.0)
+
+    '''
+        Runs the given number of ticks right away, ignoring the time
+    '''
+    def run(self, ticks):
+        for _ in range(ticks):
+            self.tick()
+        self.ticks += ticks
+
+    '''
+        Advances the simulation by exactly one tick
+    '''
+    def tick(self):
+        raise NotImplementedError
@@ -0,0 +1,288 @@
+from array import array
+from collections import deque
+
+from simulations.simulation import Simulation
+
+'''
+    Headless version of Coding Challenge #3: Snake Game
+'''
+
+WINDOW_SIZE = (600, 400)
+FOOD_SIZE = 10
+TIME = 0.1  # Refresh time (The smaller it is, the faster the game)
+
+
+'''
+    This class contains the rules of the game: the snake, the food and the status of the game
+'''
+class SnakeSimulation(Simulation):
+    TIME = TIME
+
+    def __init__(self, width=WINDOW_SIZE[0], height=WINDOW_SIZE[1], seed=None, rng=None):
+        super(SnakeSimulation, self).__init__(seed, rng)
+        self.size = (width, height)
+        self.start()
+
+    '''
+        Creates the snake and the first food item
+    '''
+    def start(self):
+        self.game_over = False  # keeps track of whether or not the game is over
+        self.food_eaten = False # whether or not the snake ate during the last tick
+        self.previous_key = ''
+
+        # randomize the initial position of the snake
+        snake_head = self.random_box()
+        self.board = Board(self.size[0] // FOOD_SIZE, self.size[1] // FOOD_SIZE)
+        self.snake = Snake(snake_head[0], snake_head[1], self.board)
+
+        # create food for the first time
+        self.create_food()
+
+    '''
+        Depending on the key, this function changes the direction of the snake
+    '''
+    def press(self, key):
+        # when the snake hasn't eaten yet, all movements are possible
+        if self.previous_key == '' or len(self.snake.body) == 1:
+            if key == 'w': self.snake.change_speed(0, FOOD_SIZE)
+            if key == 's': self.snake.change_speed(0, -FOOD_SIZE)
+            if key == 'a': self.snake.change_speed(-FOOD_SIZE, 0)
+            if key == 'd': self.snake.change_speed(FOOD_SIZE, 0)
+
+        # Once the snake starts eating, do not allow backwards movements
+        else:
+            if key == 'w' and not self.previous_key in ['s', 'w']: self.snake.change_speed(0, FOOD_SIZE)
+            if key == 's' and not self.previous_key in ['w', 's']: self.snake.change_speed(0, -FOOD_SIZE)
+            if key == 'a' and not self.previous_key in ['d', 'a']: self.snake.change_speed(-FOOD_SIZE, 0)
+            if key == 'd' and not self.previous_key in ['a', 'd']: self.snake.change_speed(FOOD_SIZE, 0)
+
+        # save the previous movement
+        self.previous_key = key
+
+    '''
+        This method updates the movement of the snake, the location of the food and the status of the game
+    '''
+    def tick(self):
+        self.food_eaten = False
+        if self.game_over:
+            return
+
+        # check if the snake is dead
+        self.game_over = self.snake.dies(*self.size)
+        if self.game_over:
+            return
+
+        # update the movement of the snake
+        self.snake.update(*self.size)
+
+        # grow the snake if it eats food, then create a new food item
+        if self.snake.ate(self.food):
+            self.snake.grow()
+            self.create_food()
+            self.food_eaten = True
+            # the snake fills the whole board, there is no room left for food
+            if self.food is None:
+                self.game_over = True
+
+    '''
+        Returns the score of the game, i.e the number of food items eaten
+    '''
+    def score(self):
+        return len(self.snake.body) - 1
+
+    '''
+        returns a random possible location of the snake (or food) on the grid
+    '''
+    def random_box(self):
+        # divide the window into squares, and pick a random square
+        max_x = self.size[0] // FOOD_SIZE
+        max_y = self.size[1] // FOOD_SIZE
+
+        # 1 and -1 are to avoid the edges
+        # multiply back by FOOD_SIZE to get the actual location
+        x = self.rng.randint(1, max_x - 1) * FOOD_SIZE
+        y = self.rng.randint(1, max_y - 1) * FOOD_SIZE
+
+        return x, y
+
+    '''
+        creates food at a random location that is not on the snake (None if the snake fills the board)
+    '''
+    def create_food(self):
+        cell = self.board.random_free_cell(self.rng)
+        self.food = None if cell is None else [cell[0] * FOOD_SIZE, cell[1] * FOOD_SIZE]
+
+
+'''
+    The grid of squares of the window (FOOD_SIZE wide), with the number of snake parts on each square,
+        and the list of the free squares where food can be placed (every square but the first column and
+        the first row, like random_box), so that moving the snake, checking if it bit itself and placing
+        food never depend on the length of the snake
+
+    The grid has a border of one square around the window, since the head of the snake leaves the
+        window one tick before the snake dies
+'''
+class Board:
+    def __init__(self, cols, rows):
+        self.cols = cols
+        self.rows = rows
+        # the squares are stored column by column, including the border
+        self.stride = rows + 2
+        self.counts = bytearray((cols + 2) * self.stride)
+
+        # free squares where food can be placed, and the position of each square in that list
+        #   (-1 if it is not in the list), to remove any square in O(1) by swapping it with the last one
+        self.free = array('I')
+        self.free_positions = array('i', [-1]) * len(self.counts)
+        for i in range(1, cols):
+            for j in range(1, rows):
+                self.add_free(self.index(i, j))
+
+    '''
+        Returns the index of the square in column i and row j
+    '''
+    def index(self, i, j):
+        return (i + 1) * self.stride + j + 1
+
+    '''
+        Checks whether or not food can be placed on the square of the given index
+    '''
+    def is_food_square(self, index):
+        i, j = divmod(index, self.stride)
+        return 2 <= i <= self.cols and 2 <= j <= self.rows
+
+    def add_free(self, index):
+        self.free_positions[index] = len(self.free)
+        self.free.append(index)
+
+    def remove_free(self, index):
+        position = self.free_positions[index]
+        last = self.free.pop()
+        if last != index:
+            self.free[position] = last
+            self.free_positions[last] = position
+        self.free_positions[index] = -1
+
+    '''
+        Adds a snake part on the square of the location (x, y)
+    '''
+    def add(self, x, y):
+        index = self.index(x // FOOD_SIZE, y // FOOD_SIZE)
+        self.counts[index] += 1
+        if self.counts[index] == 1 and self.free_positions[index] >= 0:
+            self.remove_free(index)
+
+    '''
+        Removes a snake part from the square of the location (x, y)
+    '''
+    def remove(self, x, y):
+        index = self.index(x // FOOD_SIZE, y // FOOD_SIZE)
+        self.counts[index] -= 1
+        if self.counts[index] == 0 and self.is_food_square(index):
+            self.add_free(index)
+
+    '''
+        Returns the number of snake parts on the square of the location (x, y)
+    '''
+    def count(self, x, y):
+        return self.counts[self.index(x // FOOD_SIZE, y // FOOD_SIZE)]
+
+    '''
+        Returns the column and the row of a random free square, or None if there is none
+    '''
+    def random_free_cell(self, rng):
+        if not self.free:
+            return None
+        i, j = divmod(self.free[rng.randrange(len(self.free))], self.stride)
+        return i - 1, j - 1
+
+
+'''
+    This class represents a Snake, and the behaviours associated with it: moving the snake,
+        checking if it is in bounds, checking if he bit itself, etc
+'''
+class Snake:
+    def __init__(self, x = 0, y = 0, board = None):
+        self.x = x
+        self.y = y
+        self.xspeed = FOOD_SIZE
+        self.yspeed = 0
+        self.board = board if board is not None else Board(WINDOW_SIZE[0] // FOOD_SIZE, WINDOW_SIZE[1] // FOOD_SIZE)
+        # add the head of the snake to the body (the tail is on the left, the head on the right)
+        self.body = deque([(self.x, self.y)])
+        self.board.add(self.x, self.y)
+        # number of times the body moved, so that a renderer knows how many parts changed
+        self.moves = 0
+        # location of the head before the last move, and of the tail removed by the last move
+        self.previous_head = (self.x, self.y)
+        self.previous_tail = (self.x, self.y)
+
+    '''
+        Moves the snake in the direction given by the xspeed and yspeed
+        (moves the body of the snake as well)
+    '''
+    def update(self, width, height):
+        self.previous_head = (self.x, self.y)
+        self.x += self.xspeed
+        self.y += self.yspeed
+        self.move_body()
+
+    '''
+        Changes the direction of the snake
+    '''
+    def change_speed(self, xspeed, yspeed):
+        self.xspeed = xspeed
+        self.yspeed = yspeed
+
+    '''
+        Moves the snake's body
+    '''
+    def move_body(self):
+        # Every body part takes the location of the body part before him, which is the same as
+        #    removing the tail and adding the current location of the snake as the new head
+        #    (since the last body part is the head in my design)
+        self.previous_tail = self.body.popleft()
+        self.board.remove(*self.previous_tail)
+        self.body.append((self.x, self.y))
+        self.board.add(self.x, self.y)
+        self.moves += 1
+
+    '''
+        Grows the snake, i.e. adds the newly consumed food to the snake's body
+    '''
+    def grow(self):
+        self.body.append((self.x, self.y))
+        self.board.add(self.x, self.y)
+
+
+    '''
+        Checks whether or not the snake ate the food
+    '''
+    def ate(self, food):
+        # The snake ate the food if they are at the same location
+        return self.x == food[0] and self.y == food[1]
+
+    '''
+        Checks if the snake dies
+    '''
+    def dies(self, width, height):
+        return self.eats_itself() or self.out_of_bounds(width, height)
+
+    '''
+        Checks if the snake eats itself
+    '''
+    def eats_itself(self):
+        # The head is on its own square, and so is the part before it right after the snake grew,
+        #    any other part on that square means that the snake bit itself
+        parts = self.board.count(self.x, self.y) - 1
+        if len(self.body) > 1 and self.body[-2] == (self.x, self.y):
+            parts -= 1
+        return parts > 0
+
+    '''
+        checks if the snake is out of bounds
+    '''
+    def out_of_bounds(self, width, height):
+        return self.x < 0 or self.x > width - FOOD_SIZE or \
+                self.y < 0 or self.y > height - FOOD_SIZE
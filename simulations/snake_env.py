@@ -0,0 +1,253 @@
+import random
+
+import numpy as np
+
+from simulations.snake import SnakeSimulation, WINDOW_SIZE, FOOD_SIZE
+
+'''
+    Snake environments for agents, with the rules of simulations/snake.py and without kivy:
+
+        env = SnakeEnv(cols=20, rows=20)
+        obs = env.reset(seed=0)
+        obs, reward, done, info = env.step(UP)
+
+        envs = VecSnakeEnv(4096, cols=20, rows=20, seed=0)
+        obs = envs.reset()
+        obs, rewards, dones, info = envs.step(actions)
+
+    The observations are grids of squares (FOOD_SIZE wide in the window), with EMPTY, BODY, HEAD or FOOD
+    on each square, the row 0 being the bottom of the window. They are allocated once and updated in
+    place at every step, copy them to keep them.
+
+    The reward is 1 when the snake eats, -1 when it dies, 0 otherwise.
+'''
+
+# Actions, in the order of ACTION_KEYS
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+# Key pressed for each action
+ACTION_KEYS = ('w', 'd', 's', 'a')
+
+# Content of the squares of the observations
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+
+'''
+    A single game, playing the keys of SnakeSimulation. The episode is over as soon as the snake leaves
+        the window or bites itself (the simulation only notices it at the next tick)
+'''
+class SnakeEnv:
+    def __init__(self, cols=WINDOW_SIZE[0] // FOOD_SIZE, rows=WINDOW_SIZE[1] // FOOD_SIZE):
+        # the board is given in squares, like for VecSnakeEnv, and the simulation works in pixels
+        self.cols = cols
+        self.rows = rows
+        self.size = (cols * FOOD_SIZE, rows * FOOD_SIZE)
+        self.rng = random.Random()
+        self.game = None
+        self.obs = np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    '''
+        Starts a new game (seeded with seed, unless it is None) and returns its observation
+    '''
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.game = SnakeSimulation(*self.size, rng=self.rng)
+
+        self.obs.fill(EMPTY)
+        for x, y in self.game.snake.body:
+            self.set_square(x, y, BODY)
+        self.set_square(self.game.snake.x, self.game.snake.y, HEAD)
+        if self.game.food is not None:
+            self.set_square(self.game.food[0], self.game.food[1], FOOD)
+        return self.obs
+
+    '''
+        Plays an action (UP, RIGHT, DOWN or LEFT) and returns the observation, the reward, whether
+            or not the game is over and the score
+    '''
+    def step(self, action):
+        game = self.game
+        snake = game.snake
+        tail = snake.body[0]
+        head = (snake.x, snake.y)
+
+        game.press(ACTION_KEYS[action])
+        game.run(1)
+        done = game.game_over or snake.dies(*game.size)
+
+        # Only the squares of the tail, the previous head, the new head and the food can change
+        if not game.board.count(*tail):
+            self.set_square(tail[0], tail[1], EMPTY)
+        if game.board.count(*head):
+            self.set_square(head[0], head[1], BODY)
+        if not snake.out_of_bounds(*game.size):
+            self.set_square(snake.x, snake.y, HEAD)
+
+        reward = 0.0
+        if game.food_eaten:
+            reward = 1.0
+            if game.food is not None:
+                self.set_square(game.food[0], game.food[1], FOOD)
+        if done and game.food is not None:
+            reward = -1.0
+        return self.obs, reward, done, {'score': game.score()}
+
+    def set_square(self, x, y, value):
+        self.obs[y // FOOD_SIZE, x // FOOD_SIZE] = value
+
+
+'''
+    num_envs independent games stepped together on numpy arrays, with the same rules as SnakeSimulation:
+        the snake starts on a random square going right, can't turn back once it has eaten, grows by
+        keeping the square it ate on, and food is placed on a random free square (except the first column
+        and the first row, like SnakeSimulation.random_box)
+
+    The games that are over are started again right away (their last observation is lost), and
+    info['scores'] has the score of every game at the end of the step (before it is started again)
+
+    Every snake is a ring buffer of squares (the tail at tail_pos, the head at head_pos), with the number
+    of snake parts on each square, so every step only touches the squares of the tail and the head
+'''
+class VecSnakeEnv:
+    # Moves of each action, in squares
+    DX = np.array([0, 1, 0, -1])
+    DY = np.array([1, 0, -1, 0])
+    OPPOSITE = np.array([DOWN, LEFT, UP, RIGHT])
+
+    def __init__(self, num_envs, cols=WINDOW_SIZE[0] // FOOD_SIZE, rows=WINDOW_SIZE[1] // FOOD_SIZE, seed=None):
+        self.num_envs = num_envs
+        self.cols = cols
+        self.rows = rows
+        self.rng = np.random.default_rng(seed)
+
+        squares = cols * rows
+        # a square can be in a snake twice when the snake eats, so the ring buffers have room for
+        #   twice the squares of the board
+        self.capacity = 2 * squares
+        self.envs = np.arange(num_envs)
+
+        self.obs = np.zeros((num_envs, rows, cols), dtype=np.uint8)
+        self.flat_obs = self.obs.reshape(num_envs, squares)
+        self.counts = np.zeros((num_envs, squares), dtype=np.uint8)
+        self.body = np.zeros((num_envs, self.capacity), dtype=np.int32)
+        self.head_pos = np.zeros(num_envs, dtype=np.int64)
+        self.tail_pos = np.zeros(num_envs, dtype=np.int64)
+        self.length = np.zeros(num_envs, dtype=np.int64)
+        self.direction = np.zeros(num_envs, dtype=np.int64)
+        self.food = np.zeros(num_envs, dtype=np.int64)
+
+        self.rewards = np.zeros(num_envs, dtype=np.float32)
+        self.dones = np.zeros(num_envs, dtype=bool)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+
+    '''
+        Starts every game again and returns the observations
+    '''
+    def reset(self):
+        self.reset_envs(self.envs)
+        return self.obs
+
+    '''
+        Starts the games of the given indices again
+    '''
+    def reset_envs(self, envs):
+        self.obs[envs] = EMPTY
+        self.counts[envs] = 0
+        start = self.random_food_squares(len(envs))
+        self.body[envs, 0] = start
+        self.counts[envs, start] = 1
+        self.flat_obs[envs, start] = HEAD
+        self.head_pos[envs] = 0
+        self.tail_pos[envs] = 0
+        self.length[envs] = 1
+        self.direction[envs] = RIGHT
+        self.place_food(envs)
+
+    '''
+        Returns count random squares of the area where food can be placed
+    '''
+    def random_food_squares(self, count):
+        x = self.rng.integers(1, self.cols, count)
+        y = self.rng.integers(1, self.rows, count)
+        return y * self.cols + x
+
+    '''
+        Places food on a free square of the given games, and returns the games where the snake
+            fills the whole board
+    '''
+    def place_food(self, envs):
+        food = self.random_food_squares(len(envs))
+        # Try random squares a few times, then look for the free squares of the last games
+        #   (only the games where the snake fills most of the board get there)
+        taken = np.flatnonzero(self.counts[envs, food])
+        for _ in range(8):
+            if not len(taken):
+                break
+            food[taken] = self.random_food_squares(len(taken))
+            taken = np.flatnonzero(self.counts[envs, food])
+        for k in taken:
+            free = np.flatnonzero(self.counts[envs[k]].reshape(self.rows, self.cols)[1:, 1:] == 0)
+            if len(free):
+                y, x = divmod(int(self.rng.choice(free)), self.cols - 1)
+                food[k] = (y + 1) * self.cols + x + 1
+            else:
+                food[k] = -1
+
+        placed = food >= 0
+        self.food[envs] = food
+        self.flat_obs[envs[placed], food[placed]] = FOOD
+        return envs[~placed]
+
+    '''
+        Plays one action (UP, RIGHT, DOWN or LEFT) in every game, and returns the observations, the
+            rewards, whether or not each game was over and the scores
+    '''
+    def step(self, actions):
+        envs, cols = self.envs, self.cols
+        actions = np.asarray(actions)
+
+        # Turn, unless it is a turn back and the snake has eaten
+        turn_back = (actions == self.OPPOSITE[self.direction]) & (self.length > 1)
+        self.direction = np.where(turn_back, self.direction, actions)
+
+        head = self.body[envs, self.head_pos]
+        x = head % cols + self.DX[self.direction]
+        y = head // cols + self.DY[self.direction]
+        out = (x < 0) | (x >= cols) | (y < 0) | (y >= self.rows)
+        new_head = np.where(out, 0, y * cols + x)
+
+        # Move: the tail leaves its square, the previous head becomes body
+        tail = self.body[envs, self.tail_pos]
+        self.counts[envs, tail] -= 1
+        self.tail_pos = (self.tail_pos + 1) % self.capacity
+        self.flat_obs[envs, head] = np.where(self.counts[envs, head] > 0, BODY, EMPTY)
+        self.flat_obs[envs, tail] = np.where(self.counts[envs, tail] > 0, self.flat_obs[envs, tail], EMPTY)
+
+        # The head enters its new square, where it bites the snake if a part is already there
+        self.head_pos = (self.head_pos + 1) % self.capacity
+        self.body[envs, self.head_pos] = new_head
+        bites = ~out & (self.counts[envs, new_head] > 0)
+        self.counts[envs, new_head] += 1
+        dones = out | bites
+
+        # Grow the snakes that ate: their head is in the snake twice, so the tail stays in place once
+        ate = ~dones & (new_head == self.food)
+        self.head_pos[ate] = (self.head_pos[ate] + 1) % self.capacity
+        self.body[ate, self.head_pos[ate]] = new_head[ate]
+        self.counts[ate, new_head[ate]] += 1
+        self.length[ate] += 1
+        alive = envs[~out]
+        self.flat_obs[alive, new_head[~out]] = HEAD
+
+        self.rewards[:] = ate
+        self.rewards[dones] = -1.0
+        np.subtract(self.length, 1, out=self.scores)
+        if ate.any():
+            # the snakes filling the whole board won
+            won = self.place_food(envs[ate])
+            dones[won] = True
+
+        self.dones[:] = dones
+        if dones.any():
+            self.reset_envs(envs[dones])
+        return self.obs, self.rewards, self.dones, {'scores': self.scores}
@@ -0,0 +1,455 @@
+from itertools import islice
+
+import numpy as np
+
+from simulations.simulation import Simulation
+
+'''
+    Headless version of Coding Challenge #5: Space Invaders
+'''
+
+BULLET_SIZE = (8, 8)
+SHIP_SIZE = (20, 60)
+ALIEN_SIZE = (40, 40)
+WINDOW_SIZE = (600, 400)
+BULLETS = 12
+# Number of bullets that can be on the screen at the same time (the ship can't fire when they all are)
+MAX_BULLETS = 256
+# Keys controlling the ship, in the order they are applied at each tick
+CONTROL_KEYS = ('left', 'a', 'right', 'd', 'w', 'spacebar', 'up')
+
+'''
+    Checks if the point (x, y) is in the rectangle generated by the x interval [min_x, max_x]
+        and the y interval [min_y, max_y]
+'''
+def in_bounds(x, y, min_x, max_x, min_y, max_y):
+    return min_x < x < max_x and min_y < y < max_y
+
+'''
+    Class responsible for the update of the game
+'''
+class SpaceInvadersSimulation(Simulation):
+    TIME = 0.05
+
+    def __init__(self, width=WINDOW_SIZE[0], height=WINDOW_SIZE[1], num_aliens=None, max_bullets=MAX_BULLETS,
+                 seed=None, rng=None):
+        super(SpaceInvadersSimulation, self).__init__(seed, rng)
+        self.size = (width, height)
+        # number of aliens of each game (random between 5 and 10 when None)
+        self.num_aliens = num_aliens
+        self.max_bullets = max_bullets
+        self.start()
+
+    '''
+        Set the default settings and initializes the parameter
+    '''
+    def start(self):
+        # The ship will be the same throughout the whole game:
+        self.ship = Ship(self.size[0], 20)
+
+        # keeps track of whether or not the game is over, whether or not it was won, and why
+        self.over = False
+        self.won = False
+        self.message = ""
+
+        # kepps track of the total time to calculate when to move the aliens
+        self.total_time = 0
+
+        # Directions of the aliens:
+        #   (0, 0): No movement
+        #   (1, 0): Right
+        #   (-1, 0): Left
+        #   (0, 1): Up
+        #   (0, -1): Down
+        # alien_dir keeps track of the two last directions taken by the aliens
+        self.alien_dir = [(0, 0), (1, 0)]
+
+        # Create a random number of aliens in random locations
+        num_aliens = self.num_aliens if self.num_aliens is not None else self.rng.randint(5, 10)
+        self.formation = AlienFormation([(self.rng.randint(0, self.size[0] - ALIEN_SIZE[0]),
+                                          self.rng.randint(300, self.size[1] - ALIEN_SIZE[1]))
+                                         for i in range(num_aliens)])
+        # Thin views over the formation, for code that still works with one alien at a time
+        self.aliens = [Alien(self.formation, i, i) for i in range(num_aliens)]
+        # finds the alien hit by a bullet without looping through all the aliens
+        self.alien_grid = AlienGrid(self.aliens)
+
+        # The number of bullets is 3 times the number of aliens (to make the game fair)
+        self.bullets_count = 3 * len(self.aliens)
+
+        # keeps track of the number of aliens killed
+        self.aliens_killed = 0
+
+        # keeps track of the aliens on the edge, to decide when to move down
+        self.left_alien, self.right_alien = self.get_edge_aliens()
+
+        # keeps track of the bullets on the screen
+        self.bullets = BulletPool(self.max_bullets)
+
+        # keys currently pressed by the player
+        self.pressed_keys = set()
+
+    '''
+        Gets the indices (in the formation) of the aliens on the edges
+    '''
+    def get_edge_aliens(self):
+        return self.formation.edges()
+
+    '''
+        Registers a key pressed by the player
+    '''
+    def press(self, key):
+        self.pressed_keys.add(key)
+
+    '''
+        Registers a key released by the player
+    '''
+    def release(self, key):
+        self.pressed_keys.discard(key)
+
+    '''
+        moves the ship, the aliens and bullets
+    '''
+    def tick(self):
+        # location of the ship before this tick, to draw it between two ticks
+        self.ship.previous_x = self.ship.x
+        if self.over:
+            return
+
+        self.total_time += self.TIME
+        # Only move the aliens after 1 second
+        if(self.total_time > 1):
+            self.move_aliens(self.alien_dir)
+            self.total_time = 0
+
+        # no alien, game won
+        if len(self.aliens) == 0:
+            self.end_game(True)
+
+        # check the keyboard and update ship movement
+        #   (the keys are checked in the order of CONTROL_KEYS, not in the order of the set, which
+        #   changes from a process to another, so that a replay always runs the same way)
+        for key in CONTROL_KEYS:
+            if key not in self.pressed_keys:
+                continue
+            if self.ship.x > 0:
+                if key in ['left', 'a']: self.ship.move(-1)
+            if self.ship.x < self.size[0] - SHIP_SIZE[0]:
+                if key in ['right', 'd']: self.ship.move(1)
+            # create bullets and save them
+            if key in ['w', 'spacebar', 'up']:
+                if self.bullets_count > 0 and \
+                        self.bullets.fire(self.ship.x + SHIP_SIZE[0] / 2 - BULLET_SIZE[0] / 2, SHIP_SIZE[1]):
+                    self.bullets_count -= 1
+        # no bullets, game over
+        if len(self.bullets) == 0 and self.bullets_count == 0:
+            self.end_game(False, "You ran out of bullets!")
+
+        # If a bullet is already out of the frame, stop keeping track of it
+        bullets = self.bullets
+        items = bullets.items
+        for i in range(len(bullets) - 1, -1, -1):
+            bullet = items[i]
+            if(bullet.active):
+                # If not, check if it is hitting an alien, and if yes, delete both
+                alien = self.aliens_hit(bullet)
+                if(not alien):
+                    bullet.move()
+                    continue
+                self.remove_alien(alien)
+                self.left_alien, self.right_alien = self.get_edge_aliens()
+                self.aliens_killed += 1
+            # Swap remove the bullet: the last bullet was already checked, since the loop goes backwards
+            bullets.remove(i)
+
+    '''
+        Removes an alien by moving the last alien to its place
+    '''
+    def remove_alien(self, alien):
+        last = self.aliens.pop()
+        if last is not alien:
+            self.aliens[alien.index] = last
+            last.index = alien.index
+        self.alien_grid.remove(alien)
+        self.formation.kill(alien.i)
+
+    '''
+        Moves the aliens, given thee two last directions of the aliens
+    '''
+    def move_aliens(self, alien_dir):
+        formation = self.formation
+        formation.move(*alien_dir[1])
+        # The aliens moved by whole cells of the grid, so the grid only has to be shifted
+        self.alien_grid.shift(*alien_dir[1])
+        temp = alien_dir[1]
+        if len(self.aliens) > 0:
+            # If the edge aliens are in bounds
+            if formation.x[self.left_alien] <= ALIEN_SIZE[0] or formation.x[self.right_alien] >= self.size[0] - ALIEN_SIZE[0]:
+                # If the aliens went right or left, the next step should be down
+                if alien_dir[1] == (1, 0) or alien_dir[1] == (-1, 0):
+                    alien_dir[1] = (0, -1)
+                # If the aliens went left --> down, the next step should be right
+                elif alien_dir[0] == (-1, 0) and alien_dir[1] == (0, -1):
+                    alien_dir[1] = (1, 0)
+                # If the aliens went right --> down, the next step should be left
+                elif alien_dir[0] == (1, 0) and alien_dir[1] == (0, -1):
+                    alien_dir[1] = (-1, 0)
+
+        alien_dir[0] = temp
+
+        # check if the aliens have invaded, i.e. if they have reached the ship
+        if formation.invaded(self.ship.x + SHIP_SIZE[0] / 2, SHIP_SIZE[1]):
+            self.end_game(False, "INVASION!!!")
+
+    '''
+        Ends the game, and saves whether or not the player won
+    '''
+    def end_game(self, won, message = ""):
+        self.over = True
+        self.won = won
+        self.message = message
+
+    '''
+        Returns the alien hit by the given bullet
+    '''
+    def aliens_hit(self, bullet):
+        return self.alien_grid.hit(bullet.x, bullet.y)
+
+
+'''
+    Uniform grid of ALIEN_SIZE cells, with the aliens whose bottom left corner is in each cell. An alien
+        hit by a point has its corner in the cell of the point or in the cells on its left and below,
+        so finding it only checks the aliens of 4 cells
+
+    The aliens always move together by whole cells, so instead of moving every alien to another cell,
+        the cells and the locations of the aliens are stored relative to the offset of the formation,
+        and moving the aliens only moves it
+'''
+class AlienGrid:
+    def __init__(self, aliens):
+        # every cell has a list of (x, y, alien), with the location of the alien relative to the offset
+        self.cells = {}
+        self.offset = (0, 0)
+        for alien in aliens:
+            self.add(alien)
+
+    '''
+        Returns the point (x, y) relative to the offset
+    '''
+    def relative(self, x, y):
+        return x - self.offset[0] * ALIEN_SIZE[0], y - self.offset[1] * ALIEN_SIZE[1]
+
+    '''
+        Returns the cell of a point relative to the offset
+    '''
+    def cell(self, x, y):
+        return int(x // ALIEN_SIZE[0]), int(y // ALIEN_SIZE[1])
+
+    '''
+        Moves every alien of the grid by the given number of cells
+    '''
+    def shift(self, dx, dy):
+        self.offset = (self.offset[0] + dx, self.offset[1] + dy)
+
+    def add(self, alien):
+        x, y = self.relative(alien.x, alien.y)
+        self.cells.setdefault(self.cell(x, y), []).append((x, y, alien))
+
+    def remove(self, alien):
+        cell = self.cell(*self.relative(alien.x, alien.y))
+        entries = self.cells[cell]
+        for k, entry in enumerate(entries):
+            if entry[2] is alien:
+                del entries[k]
+                break
+        if not entries:
+            del self.cells[cell]
+
+    '''
+        Returns the alien in which the point (x, y) is, or None
+    '''
+    def hit(self, x, y):
+        x, y = self.relative(x, y)
+        i, j = self.cell(x, y)
+        for cell in ((i, j), (i - 1, j), (i, j - 1), (i - 1, j - 1)):
+            for alien_x, alien_y, alien in self.cells.get(cell, ()):
+                # the bullet hits the alien if the bullet is in the bounds of the alien
+                if in_bounds(x, y, alien_x, alien_x + ALIEN_SIZE[0], alien_y, alien_y + ALIEN_SIZE[1]):
+                    return alien
+        return None
+
+
+'''
+    The locations of all the aliens in numpy arrays, with the aliens still alive, so that the whole
+        formation is moved and checked at once
+'''
+class AlienFormation:
+    def __init__(self, locations):
+        locations = np.array(locations, dtype=float).reshape(-1, 2)
+        self.x = locations[:, 0].copy()
+        self.y = locations[:, 1].copy()
+        self.alive = np.ones(len(locations), dtype=bool)
+
+        # The aliens from left to right: they all move together, so this order never changes,
+        #   and the aliens on the edges are found by skipping the dead aliens from both ends
+        self.order = np.argsort(self.x, kind='stable')
+        self.left = 0
+        self.right = len(locations) - 1
+
+    def __len__(self):
+        return len(self.x)
+
+    '''
+        Moves all the aliens by the given number of ALIEN_SIZE steps
+    '''
+    def move(self, dx, dy):
+        if dx:
+            self.x += dx * ALIEN_SIZE[0]
+        if dy:
+            self.y += dy * ALIEN_SIZE[1]
+
+    '''
+        Removes the alien of index i from the formation
+    '''
+    def kill(self, i):
+        self.alive[i] = False
+        order, alive = self.order, self.alive
+        while self.left <= self.right and not alive[order[self.left]]:
+            self.left += 1
+        while self.right >= self.left and not alive[order[self.right]]:
+            self.right -= 1
+
+    '''
+        Returns the indices of the leftmost and the rightmost aliens alive, or -1, -1 when all the aliens
+            are dead
+    '''
+    def edges(self):
+        if self.left > self.right:
+            return -1, -1
+        return int(self.order[self.left]), int(self.order[self.right])
+
+    '''
+        Checks whether or not an alien alive reached the bottom of the window or the point (x, y)
+    '''
+    def invaded(self, x, y):
+        x_min, y_min = self.x, self.y
+        return bool(np.any(self.alive & ((y_min <= 0) |
+                                         ((x_min < x) & (x < x_min + ALIEN_SIZE[0]) &
+                                          (y_min < y) & (y < y_min + ALIEN_SIZE[1])))))
+
+
+'''
+    Representation of an Alien object, providing methods
+        necessary to move the alien (the alien is a view on one index of an AlienFormation)
+'''
+class Alien:
+    def __init__(self, formation, i, index=None):
+        self.formation = formation
+        self.i = i
+        # position of the alien in the list of aliens of the game
+        self.index = index
+
+    @property
+    def x(self):
+        return float(self.formation.x[self.i])
+
+    @x.setter
+    def x(self, x):
+        self.formation.x[self.i] = x
+
+    @property
+    def y(self):
+        return float(self.formation.y[self.i])
+
+    @y.setter
+    def y(self, y):
+        self.formation.y[self.i] = y
+
+    '''
+        Move the alien by the given coordinates
+    '''
+    def move(self, dx, dy):
+        self.x += dx * ALIEN_SIZE[0]
+        self.y += dy * ALIEN_SIZE[1]
+
+'''
+    Class representing a bullet, with behaviours such as moving the bullet
+'''
+class Bullet:
+    __slots__ = ('x', 'y', 'previous_y', 'active')
+
+    def __init__(self, x, y):
+        self.reset(x, y)
+
+    '''
+        Places the bullet at (x, y), to reuse it for a new shot
+    '''
+    def reset(self, x, y):
+        self.x = x
+        self.y = y
+        self.previous_y = y
+        self.active = in_bounds(self.x, self.y, 0, WINDOW_SIZE[0], 0, WINDOW_SIZE[1])
+
+    def move(self):
+        self.previous_y = self.y
+        self.y += 5
+        self.active = in_bounds(self.x, self.y, 0, WINDOW_SIZE[0], 0, WINDOW_SIZE[1])
+
+
+'''
+    A fixed number of bullets created once and reused for every shot: the bullets on the screen are the
+        first len(pool) items, and a bullet is removed by swapping it with the last bullet on the screen,
+        so firing and removing bullets never creates or destroys objects
+'''
+class BulletPool:
+    def __init__(self, capacity=MAX_BULLETS):
+        self.items = [Bullet(0, 0) for i in range(capacity)]
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    '''
+        Iterates over the bullets on the screen
+    '''
+    def __iter__(self):
+        return islice(self.items, self.count)
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError('bullet index out of range')
+        return self.items[i]
+
+    '''
+        Puts a bullet on the screen at (x, y) and returns it, or None if all the bullets are already
+            on the screen
+    '''
+    def fire(self, x, y):
+        if self.count == len(self.items):
+            return None
+        bullet = self.items[self.count]
+        bullet.reset(x, y)
+        self.count += 1
+        return bullet
+
+    '''
+        Removes the bullet at index i from the screen, by swapping it with the last bullet on the screen
+    '''
+    def remove(self, i):
+        last = self.count - 1
+        items = self.items
+        items[i], items[last] = items[last], items[i]
+        self.count = last
+
+
+'''
+    Class representing a ship, with behaviours such as moving the ship
+'''
+
+class Ship:
+    def __init__(self, width, size):
+        self.x = width / 2
+        self.previous_x = self.x
+
+    def move(self, dx):
+        self.x += dx * 5
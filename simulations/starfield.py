@@ -0,0 +1,214 @@
+import numpy as np
+
+from simulations.simulation import Simulation
+
+'''
+    Headless version of Coding Challenge #1: Star Field
+'''
+class StarfieldSimulation(Simulation):
+    TIME = 0.005    # Update time: the smaller, the faster the star move
+
+    # The stars don't actually move in a continuous way, so the bigger the expanding ratio,
+    #   the bigger gaps will the stars take to get to the next location
+    EXPANDING_RATIO = 100
+
+    # Maximum size of a star, i.e size it will have when it gets to the edge
+    MAX_SIZE = 10
+
+    # Ratio controlling the length of the trail of each star. The smaller the ratio, the longer the
+    #   trail will be
+    TRAIL_RATIO = 10
+
+    def __init__(self, num_stars=100, width=400, height=400, seed=None, rng=None):
+        super(StarfieldSimulation, self).__init__(seed, rng)
+        self.size = (width, height)
+
+        # numpy generator for the random numbers drawn for many stars at once, seeded from self.rng
+        #   so that the seed of the simulation also sets it
+        self.np_rng = np.random.default_rng(self.rng.getrandbits(64))
+
+        # Contains the location, size, initial location and color of every star
+        self.store = StarStore(num_stars)
+
+        # Keeps track of the stars relocated since the last time the mask was cleared
+        #   (the renderer uses it to only update the colors that changed)
+        self.relocated = np.zeros(num_stars, dtype=bool)
+
+        # Create the stars at the center of the window, so that they only appear
+        #   a quarter of the width away from the center horizontally, and
+        #   a quarter of the height away from the center vertically
+        self.relocate_stars(np.ones(num_stars, dtype=bool))
+
+        # The trail of the first stars starts from the center of the star
+        self.store.initial_x += self.store.size / 2
+        self.store.initial_y += self.store.size / 2
+
+        # Thin views over the store, for code that still works with one star at a time
+        self.stars = [Star(self.store, i) for i in range(num_stars)]
+
+    '''
+        This function determines the size of the star by mapping its
+            distance from the center from the distances range to the
+            sizes range (works on a single distance or an array of distances)
+    '''
+    def get_star_size(self, distance_from_center):
+        max_distance = distance(0, 0, self.size[0] / 2, self.size[1] / 2)
+        return map(distance_from_center, 0, max_distance, 0, self.MAX_SIZE)
+
+    '''
+        Relocates the stars selected by the mask at a random location near the center,
+            with a random color
+    '''
+    def relocate_stars(self, mask):
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return
+        store = self.store
+
+        x = self.np_rng.integers(int(self.size[0] * 3 / 8), int(self.size[0] * 5 / 8) + 1, count).astype(float)
+        y = self.np_rng.integers(int(self.size[1] * 3 / 8), int(self.size[1] * 5 / 8) + 1, count).astype(float)
+
+        store.x[mask] = x
+        store.y[mask] = y
+        store.size[mask] = self.get_star_size(distance(x, y, self.size[0] / 2, self.size[1] / 2))
+
+        # Update the initial location of the stars, necessary for the trail
+        store.initial_x[mask] = x
+        store.initial_y[mask] = y
+
+        # Update the color of the stars (makes it less boring)
+        store.colors[mask] = self.np_rng.uniform(0, 1, (count, 3))
+
+        self.relocated |= mask
+
+    '''
+        This function does the main job, which is, moving the stars,
+            checking if they're still inbounds, and if they are not,
+            relocating them
+    '''
+    def tick(self):
+        store = self.store
+        center = (self.size[0] / 2, self.size[1] / 2)
+
+        # Check which stars are in bounds
+        in_bounds = self.in_bounds()
+
+        # Move the stars in bounds along the vector from the center of the window to the star,
+        #   divided by the expanding ratio to make the stars take smaller gaps when they move
+        store.x[in_bounds] += (store.x[in_bounds] - center[0]) / self.EXPANDING_RATIO
+        store.y[in_bounds] += (store.y[in_bounds] - center[1]) / self.EXPANDING_RATIO
+
+        # Update the size of the stars, since they moved
+        store.size[in_bounds] = self.get_star_size(distance(store.x[in_bounds], store.y[in_bounds],
+                                                            center[0], center[1]))
+
+        # If a star is not in bounds, relocate it
+        self.relocate_stars(~in_bounds)
+
+    '''
+        Returns the trail of every star as a (number of stars, 4) array of line points
+    '''
+    def get_trails(self):
+        store = self.store
+
+        # Set the ending point of the lines to the center of the stars
+        #   (Not the bottom left edge, which explains the size / 2)
+        end_x = store.x + store.size / 2
+        end_y = store.y + store.size / 2
+
+        # Get the starting point of the trails, since its not necessarily the
+        #   starting point of the stars
+        start_x = end_x - (end_x - store.initial_x) / self.TRAIL_RATIO
+        start_y = end_y - (end_y - store.initial_y) / self.TRAIL_RATIO
+
+        return np.stack((end_x, end_y, start_x, start_y), axis=1)
+
+    '''
+        Returns the mask of the stars that are in bounds
+    '''
+    def in_bounds(self):
+        store = self.store
+        return (0 < store.x) & (store.x < self.size[0]) & (0 < store.y) & (store.y < self.size[1])
+
+
+'''
+    Returns the distance between two points (or two arrays of points)
+'''
+def distance(x1, y1, x2, y2):
+    Dx = x1 - x2
+    Dy = y1 - y2
+    return np.sqrt(Dx * Dx + Dy * Dy)
+
+'''
+    Returns the vector from the starting point (x1, y1) to the
+        ending point (x2, y2)
+'''
+def vector(x1, y1, x2, y2):
+    return [x2 - x1, y2 - y1]
+
+'''
+    Maps a number x in a range [min_1, max_1] to a corresponding number in the range [min_2, max_2]
+'''
+def map(x, min_1, max_1, min_2, max_2):
+    return x * (max_2 - min_2) / (max_1 - min_1)
+
+
+'''
+    Struct of arrays holding every star: one numpy array per property, indexed by star
+'''
+class StarStore:
+
+    def __init__(self, count):
+        self.x = np.zeros(count)
+        self.y = np.zeros(count)
+        self.size = np.zeros(count)
+        self.initial_x = np.zeros(count)
+        self.initial_y = np.zeros(count)
+        self.colors = np.zeros((count, 3))
+
+    def __len__(self):
+        return len(self.x)
+
+
+'''
+    Class representing a star, providing methods to change its location
+        (the star is a view on one index of a StarStore)
+'''
+class Star():
+
+    def __init__(self, store, i):
+        self.store = store
+        self.i = i
+
+    @property
+    def x(self):
+        return float(self.store.x[self.i])
+
+    @x.setter
+    def x(self, x):
+        self.store.x[self.i] = x
+
+    @property
+    def y(self):
+        return float(self.store.y[self.i])
+
+    @y.setter
+    def y(self, y):
+        self.store.y[self.i] = y
+
+    @property
+    def size(self):
+        return float(self.store.size[self.i])
+
+    @size.setter
+    def size(self, size):
+        self.store.size[self.i] = size
+
+    def update(self, x, y, size):
+        self.x = x
+        self.y = y
+        self.size = size
+
+    def translate(self, vector):
+        self.x += vector[0]
+        self.y += vector[1]
@@ -0,0 +1,5 @@
+'''
+    Tests of the headless simulations, run them from the root of the repository:
+
+        python -m pytest tests
+'''
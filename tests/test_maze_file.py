@@ -0,0 +1,87 @@
+import io
+
+import pytest
+
+from simulations import maze_file
+from simulations.maze import MazeSimulation, TOP, RIGHT, BOTTOM, LEFT
+from simulations.maze_file import save_maze, load_region, read_rows, pack_header, MazeFile
+from simulations.maze_solvers import SOLVERS
+
+'''
+    Regression tests for the maze files: invalid files, and solving a region clipped out of a
+    bigger maze file
+'''
+
+# Wall crossed by a move of (columns, rows)
+MOVES = {(0, 1): TOP, (1, 0): RIGHT, (0, -1): BOTTOM, (-1, 0): LEFT}
+
+'''
+    Saves a generated maze to a file and returns its path
+'''
+def saved_maze(tmp_path, rows, cols, seed):
+    maze = MazeSimulation(rows, cols, seed=seed)
+    maze.generate()
+    path = str(tmp_path / 'maze_{}.maze'.format(seed))
+    save_maze(maze, path)
+    return path
+
+
+def test_region_border_is_closed(tmp_path):
+    path = saved_maze(tmp_path, 50, 50, seed=0)
+    maze = load_region(path, 20, 20, 8, 8)
+    rows, grid = maze.rows, maze.grid
+    for index in range(len(grid)):
+        if index % rows == 0:
+            assert grid[index] & BOTTOM
+        if index % rows == rows - 1:
+            assert grid[index] & TOP
+        if index < rows:
+            assert grid[index] & LEFT
+        if index >= len(grid) - rows:
+            assert grid[index] & RIGHT
+
+
+def test_solve_clipped_region(tmp_path):
+    for seed in range(30):
+        path = saved_maze(tmp_path, 50, 50, seed)
+        for i, j in [(0, 0), (20, 20), (42, 42), (45, 3)]:
+            maze = load_region(path, i, j, 8, 8)
+            rows = maze.rows
+            found = set()
+            for name, solver in SOLVERS.items():
+                solution, visited = solver().solve(maze)
+                found.add(bool(solution))
+                if not solution:
+                    continue
+                assert solution[0] == 0 and solution[-1] == len(maze.grid) - 1
+                # every move of the path goes through an open wall to the next cell of the region
+                for cell, neighbor in zip(solution, solution[1:]):
+                    cell_i, cell_j = divmod(cell, rows)
+                    neighbor_i, neighbor_j = divmod(neighbor, rows)
+                    assert abs(cell_i - neighbor_i) + abs(cell_j - neighbor_j) == 1, (name, seed, cell, neighbor)
+                    wall = MOVES[(neighbor_i - cell_i, neighbor_j - cell_j)]
+                    assert not maze.grid[cell] & wall, (name, seed, cell, neighbor)
+            # the solvers agree on whether the goal can be reached
+            assert len(found) == 1
+
+
+@pytest.mark.parametrize('data', [b'', b'MAZE', b'MAZE\x01\x02', b'ABCD' + pack_header(2, 2)[4:] + b'\0\0',
+                                  pack_header(2, 2)[:4] + b'\x09' + pack_header(2, 2)[5:] + b'\0\0',
+                                  pack_header(2, 2) + b'\0'])
+def test_invalid_file_raises_value_error_and_is_closed(tmp_path, monkeypatch, data):
+    path = tmp_path / 'invalid.maze'
+    path.write_bytes(data)
+
+    # keep the files opened by MazeFile, to check that they are closed
+    opened = []
+    def tracking_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+    monkeypatch.setattr(maze_file, 'open', tracking_open, raising=False)
+
+    with pytest.raises(ValueError):
+        MazeFile(str(path))
+    assert len(opened) == 1 and opened[0].closed
+
+    with pytest.raises(ValueError):
+        list(read_rows(io.BytesIO(data)))
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+from simulations.replay import ReplayWriter, PRESS, RELEASE, END
+
+'''
+    Regression tests for replaying a recording in other processes than the one that recorded it
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the state of the space invaders game at the end of a replay
+PRINT_REPLAY = '''
+import sys
+from simulations.replay import replay
+game, simulation = replay(sys.argv[1])
+print(simulation.ship.x, [(bullet.x, bullet.y) for bullet in simulation.bullets], simulation.bullets_count)
+'''
+
+'''
+    Replays a recording in a new process with the given hash seed, and returns what it printed
+'''
+def replay_with_hash_seed(path, hash_seed):
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    return subprocess.run([sys.executable, '-c', PRINT_REPLAY, path], cwd=ROOT, env=env,
+                          capture_output=True, check=True, text=True).stdout
+
+
+def test_replay_does_not_depend_on_hash_seed(tmp_path):
+    path = str(tmp_path / 'space_invaders.replay')
+    with open(path, 'wb') as f:
+        writer = ReplayWriter(f, 'space_invaders', 0, 600, 400)
+        # hold left and right together against the left edge, with other keys in the set as well
+        tick = 0
+        for key in ['left', 'right', 'a', 'escape', 'spacebar', 'up', 'q']:
+            writer.write_event(tick, PRESS, key)
+            tick += 3
+        writer.write_event(tick + 20, RELEASE, 'spacebar')
+        writer.write_event(tick + 40, END)
+
+    results = {replay_with_hash_seed(path, hash_seed) for hash_seed in range(8)}
+    assert len(results) == 1, results